@@ -1,20 +1,107 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, font as tkFont
-import feedparser
-import webbrowser
-from datetime import datetime
 import time
+STARTUP_STARTED = time.perf_counter() # Before the other imports, so --profile-startup can time them
+import tkinter as tk
+from tkinter import ttk, messagebox, scrolledtext, filedialog, font as tkFont
+from datetime import datetime, timedelta, timezone
+import calendar
+import sys
+import argparse
 import json
 import os
-from threading import Thread
+import sqlite3
+import heapq
+import itertools
+import bisect
+import re
+import queue
+import gzip
+import zlib
+import ssl
+import io
+import urllib.request
+import urllib.error
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import socket
+import functools
+import xml.etree.ElementTree as ET
+import hashlib
+import base64
+from collections import OrderedDict
+from threading import Thread, Lock, BoundedSemaphore, Timer, Condition, Event
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+import importlib.util
+from urllib.parse import urlsplit, urljoin
+# feedparser, webbrowser, multiprocessing and Pillow are slow to import, so they are imported where first used
+PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None # Optional: decodes the JPEG thumbnails Tk can't read
 
 # --- Configuration Files (MODIFIED) ---
 FEEDS_FILE = "feeds.json"
 VIEWED_FILE = "viewed.json"
 CONFIG_FILE = "config.json" # New config file
+FEED_CACHE_FILE = "feed_cache.json" # ETag/Last-Modified and last entries per feed
+VIDEO_DB_FILE = "videos.db" # SQLite store of every fetched video
+THUMBNAIL_CACHE_DIR = "thumbnails" # Resized thumbnails (PNG), trimmed to thumbnail_cache_mb
+FEED_HEALTH_FILE = "feed_health.json" # Failure history of feeds that keep failing
 
 # --- Default Settings ---
 DEFAULT_VIDEOS_PER_CHANNEL = 15 # Default limit
+DEFAULT_FETCH_WORKERS = 8 # Feeds fetched in parallel during a refresh
+DEFAULT_PER_HOST_CONNECTIONS = 4 # Politeness limit: concurrent requests per host
+DEFAULT_REFRESH_DEADLINE = 60 # Seconds before a refresh shows what it has; slower feeds are merged in later
+VIEWED_SAVE_DELAY = 2.0 # Seconds of quiet before viewed.json is written back
+DEFAULT_VIEWED_RETENTION_DAYS = 365 # Viewed marks older than this are forgotten
+VIEWED_TOUCH_INTERVAL = 24 * 60 * 60 # Marks of videos still listed are renewed at most this often (seconds)
+VIEWED_FORMAT = 2 # viewed.json layout version (1 was a plain {"yt:video:...": true} dict)
+YT_VIDEO_ID_PREFIX = "yt:video:"
+YT_VIDEO_ID_LENGTH = 11
+
+# --- Background Polling ---
+POLL_MIN_INTERVAL = 10 * 60 # Most active channels are polled at most this often (seconds)
+POLL_MAX_INTERVAL = 24 * 60 * 60 # Dormant channels are still polled once a day
+POLL_DEFAULT_INTERVAL = 60 * 60 # Channels without enough upload history
+POLL_CADENCE_DIVISOR = 4 # Poll ~4 times per typical gap between uploads
+POLL_ERROR_BACKOFF_MAX = 6 * 60 * 60 # Cap for the exponential backoff after errors
+
+# --- Feed Health (Circuit Breaker) ---
+BREAKER_FAILURE_THRESHOLD = 3 # Failures in a row before a feed is skipped
+BREAKER_BASE_COOLDOWN = 60 * 60 # First skip period (seconds), doubled with every further failure
+BREAKER_MAX_COOLDOWN = 7 * 24 * 60 * 60 # Dead feeds are still retried once a week
+BREAKER_ONLINE_WINDOW = 10 * 60 # A single feed's connection failure counts if another feed was fetched this recently (seconds)
+
+# --- Search & Filter ---
+FILTER_ALL_CHANNELS = "All channels"
+FILTER_ALL_GROUPS = "All groups"
+FILTER_UNGROUPED = "Ungrouped" # Feeds without a "group"
+SEARCH_MIN_PREFIX = 2 # A shorter last word is ignored until more of it is typed
+FILTER_DATE_RANGES = { # Label -> max age (None = no limit)
+    "Any time": None,
+    "Last 24 hours": timedelta(days=1),
+    "Last 7 days": timedelta(days=7),
+    "Last 30 days": timedelta(days=30),
+    "Last year": timedelta(days=365),
+}
+
+# --- Result Streaming ---
+RESULT_DRAIN_INTERVAL_MS = 100 # How often the UI drains finished feeds from the result queue
+PARSE_OFFLOAD_MIN_FEEDS = 100 # Refreshes with at least this many feeds parse in worker processes
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 ...'
+FETCH_TIMEOUT = 30 # Default seconds before a feed download is abandoned (feed_timeout)
+POOL_IDLE_TIMEOUT = 60 # Seconds an idle keep-alive connection is kept for reuse
+MAX_REDIRECTS = 5
+READ_CHUNK_SIZE = 64 * 1024 # Response bodies are read in chunks so the feed timeout is checked in between
+
+
+# --- Headless Server (--serve) ---
+SERVE_DEFAULT_HOST = "127.0.0.1" # Local only; pass --host 0.0.0.0 to share it on the network
+SERVE_DEFAULT_PORT = 8787
+DEFAULT_SERVE_INTERVAL = 15 * 60 # Seconds between refreshes of every feed
+SERVE_MAX_VIDEOS = 500 # Newest unviewed videos in the served list
+
+# --- Startup Profiling (--profile-startup) ---
+STARTUP_TARGET_MS = 500 # First paint budget; --profile-startup exits with status 1 above it
+STARTUP_FALLBACK_MS = 3000 # Load the data anyway if the window isn't shown by then (e.g. started minimized)
 
 
 # --- Dark Theme Colors ---
@@ -26,27 +113,50 @@ COLOR_LINK = "#66b3ff"
 COLOR_SELECT_BG = "#555555" # Used for Listbox selection
 COLOR_SELECT_FG = "#ffffff" # Used for Listbox selection text
 COLOR_BORDER = "#4f4f4f"
+COLOR_ERROR = "#ff8080" # Feeds that keep failing
 
 # --- Font Configuration ---
 FONT_SIZE_BASE = 11
 FONT_SIZE_TITLE = 12
 FONT_SIZE_INFO = 9
 
+# --- Video List Layout ---
+LIST_OVERSCAN_ROWS = 5 # Rows built above/below the viewport
+LIST_ROW_GAP = 5 # Vertical space between rows
+DEFAULT_PAGE_SIZE = 200 # Videos put in the list at first; "Load more" adds another page
+
+# --- Thumbnails ---
+DEFAULT_THUMBNAIL_CACHE_MB = 50 # Disk cache size limit
+THUMBNAIL_MEMORY_ITEMS = 300 # Decoded PhotoImages kept in memory (LRU)
+THUMBNAIL_WORKERS = 4 # Concurrent thumbnail downloads
+
 # --- Data Loading/Saving (MODIFIED for JSON) ---
 
 # --- *** NEW Config Loading/Saving *** ---
 
 def load_config():
     """Loads configuration from config.json."""
-    defaults = {"videos_per_channel": DEFAULT_VIDEOS_PER_CHANNEL}
+    defaults = {
+        "videos_per_channel": DEFAULT_VIDEOS_PER_CHANNEL,
+        "fetch_workers": DEFAULT_FETCH_WORKERS,
+        "per_host_connections": DEFAULT_PER_HOST_CONNECTIONS,
+        "viewed_retention_days": DEFAULT_VIEWED_RETENTION_DAYS,
+        "thumbnail_cache_mb": DEFAULT_THUMBNAIL_CACHE_MB,
+        "page_size": DEFAULT_PAGE_SIZE,
+        "feed_timeout": FETCH_TIMEOUT,
+        "refresh_deadline": DEFAULT_REFRESH_DEADLINE,
+        "serve_interval": DEFAULT_SERVE_INTERVAL,
+    }
     if not os.path.exists(CONFIG_FILE):
         return defaults # Return defaults if file doesn't exist
     try:
         with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
             config_data = json.load(f)
-            # Ensure the specific key exists, otherwise use default
-            if "videos_per_channel" not in config_data or not isinstance(config_data["videos_per_channel"], int):
-                 config_data["videos_per_channel"] = DEFAULT_VIDEOS_PER_CHANNEL
+            # Ensure the integer keys exist and are valid, otherwise use defaults
+            for key, default_value in list(defaults.items()):
+                value = config_data.get(key)
+                if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                    config_data[key] = default_value
             # You could load other settings here in the future
             # Merge loaded data with defaults to ensure all keys exist
             defaults.update(config_data)
@@ -99,32 +209,2197 @@ def save_feeds(feeds_data):
     except Exception as e:
         print(f"Error saving feeds data: {e}")
 
+# --- Subscription Import/Export ---
+def feed_url_key(url):
+    """Key for duplicate detection: ignores surrounding spaces, http/https, host case and #fragments."""
+    parts = urlsplit(url.strip())
+    key = parts.netloc.lower() + parts.path
+    return key + "?" + parts.query if parts.query else key
+
+def parse_subscriptions(data):
+    """
+    Reads an OPML document or a plain list of URLs (one per line, optionally followed by a name;
+    '#' starts a comment) from bytes. Returns a list of (url, name or None, group or None); OPML
+    folders become groups. Raises ValueError.
+    """
+    if data.lstrip().startswith(b"<"):
+        try:
+            root = ET.fromstring(data)
+        except ET.ParseError as e:
+            raise ValueError(f"Not a valid OPML file ({e})")
+        subscriptions = []
+        def walk(element, group):
+            for outline in element.findall("outline"):
+                url = outline.get("xmlUrl") or outline.get("xmlurl")
+                if url:
+                    subscriptions.append((url.strip(), outline.get("title") or outline.get("text"), group))
+                else: # A folder, as feed readers export their categories
+                    walk(outline, outline.get("title") or outline.get("text") or group)
+        body = root.find("body")
+        walk(body if body is not None else root, None)
+        return subscriptions
+    subscriptions = []
+    for line in data.decode("utf-8", errors="replace").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        url, _, name = line.partition(" ")
+        if url.startswith(("http://", "https://")):
+            subscriptions.append((url, name.strip() or None, None))
+    return subscriptions
+
+def feeds_to_opml(feeds_data):
+    """Returns the feed list as an OPML 2.0 document (bytes), with each group as a folder outline."""
+    opml = ET.Element("opml", version="2.0")
+    ET.SubElement(ET.SubElement(opml, "head"), "title").text = "YouTube RSS Viewer subscriptions"
+    body = ET.SubElement(opml, "body")
+    folders = {}
+    for feed_info in feeds_data:
+        name = feed_info.get('name') or feed_info['url']
+        group = feed_info.get('group')
+        parent = body
+        if group:
+            parent = folders.get(group)
+            if parent is None:
+                parent = folders[group] = ET.SubElement(body, "outline", text=group, title=group)
+        ET.SubElement(parent, "outline", type="rss", text=name, title=name, xmlUrl=feed_info['url'])
+    ET.indent(opml)
+    return ET.tostring(opml, encoding="utf-8", xml_declaration=True) + b"\n"
+
 # --- Core Feed Parsing Logic (fetch_single_feed - Unchanged) ---
 # ... (keep the fetch_single_feed function exactly as before) ...
 
 
+def _compact_video_id(video_id):
+    """'yt:video:XXXXXXXXXXX' -> 'XXXXXXXXXXX'; any other ID is kept as is."""
+    if video_id.startswith(YT_VIDEO_ID_PREFIX) and len(video_id) == len(YT_VIDEO_ID_PREFIX) + YT_VIDEO_ID_LENGTH:
+        return video_id[len(YT_VIDEO_ID_PREFIX):]
+    return video_id
+
+
 def load_viewed():
-    """Loads viewed video IDs from the JSON file."""
+    """
+    Loads viewed videos from the JSON file as {compact ID: viewed epoch seconds}.
+    Files in the old {"yt:video:...": true} format are converted, stamped with the current time.
+    """
     if not os.path.exists(VIEWED_FILE):
         return {}
     try:
         with open(VIEWED_FILE, 'r', encoding='utf-8') as f: # Specify encoding
-            return json.load(f)
+            data = json.load(f)
     except (json.JSONDecodeError, FileNotFoundError):
         return {}
     except Exception as e:
         print(f"Error loading viewed status: {e}")
         return {}
+    if not isinstance(data, dict):
+        return {}
+    if data.get("format") != VIEWED_FORMAT: # Old format: one dict entry per full ID
+        now = int(time.time())
+        return {_compact_video_id(video_id): now for video_id in data}
+    viewed = {}
+    packed, stamps = data.get("youtube_ids", ""), data.get("youtube_viewed", [])
+    for index, stamp in enumerate(stamps):
+        viewed[packed[index * YT_VIDEO_ID_LENGTH:(index + 1) * YT_VIDEO_ID_LENGTH]] = stamp
+    viewed.update(data.get("other", {}))
+    return viewed
 
 def save_viewed(viewed_dict):
-    """Saves viewed video IDs to the JSON file."""
+    """
+    Saves {compact ID: viewed epoch seconds} to the JSON file. YouTube IDs are packed into one
+    string of 11-char IDs (sorted) with a parallel list of timestamps; other IDs go in a dict.
+    """
+    youtube_ids = sorted(video_id for video_id in viewed_dict if len(video_id) == YT_VIDEO_ID_LENGTH)
+    youtube_set = set(youtube_ids)
+    data = {
+        "format": VIEWED_FORMAT,
+        "youtube_ids": "".join(youtube_ids),
+        "youtube_viewed": [int(viewed_dict[video_id]) for video_id in youtube_ids],
+        "other": {video_id: int(stamp) for video_id, stamp in viewed_dict.items() if video_id not in youtube_set},
+    }
     try:
-        with open(VIEWED_FILE, 'w', encoding='utf-8') as f: # Specify encoding
-            json.dump(viewed_dict, f, indent=4)
+        write_json_atomic(VIEWED_FILE, data)
     except Exception as e:
         print(f"Error saving viewed status: {e}")
 
 
+def write_json_atomic(path, data, indent=None):
+    """Writes JSON to a temp file and renames it over path, so a crash never leaves a half-written file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ViewedStore:
+    """
+    In-memory authority for viewed videos, keyed by compact ID with the time they were marked
+    or last seen listed (see touch). Entries older than retention_days are dropped. Changes are written back to viewed.json
+    in one batch once no further change happened for `delay` seconds (write-behind).
+    """
+    def __init__(self, delay=VIEWED_SAVE_DELAY, retention_days=DEFAULT_VIEWED_RETENTION_DAYS):
+        self.delay = delay
+        self.retention_days = retention_days
+        self._viewed = load_viewed()
+        self._lock = Lock()
+        self._write_lock = Lock() # Held while writing viewed.json, so snapshots reach the file in order
+        self._timer = None
+        self._dirty = False
+        with self._lock:
+            if self._expire():
+                self._schedule_save()
+
+    def __contains__(self, video_id):
+        return _compact_video_id(video_id) in self._viewed
+
+    def __len__(self):
+        return len(self._viewed)
+
+    def mark(self, video_id):
+        """Marks a video as viewed. Returns False if it already was."""
+        return self.mark_many([video_id]) == 1
+
+    def mark_many(self, video_ids):
+        """Marks several videos as viewed with a single write. Returns how many were new."""
+        now = int(time.time())
+        added = 0
+        with self._lock:
+            for video_id in video_ids:
+                key = _compact_video_id(video_id)
+                if key not in self._viewed:
+                    self._viewed[key] = now
+                    added += 1
+            if added:
+                self._schedule_save()
+        return added
+
+    def touch(self, video_ids):
+        """
+        Renews the time of viewed videos that are still listed, so retention only forgets videos
+        no feed shows anymore (a dormant channel keeps its last uploads in its feed for good).
+        """
+        now = int(time.time())
+        renewed = 0
+        with self._lock:
+            for video_id in video_ids:
+                key = _compact_video_id(video_id)
+                stamp = self._viewed.get(key)
+                if stamp is not None and now - stamp > VIEWED_TOUCH_INTERVAL:
+                    self._viewed[key] = now
+                    renewed += 1
+            if renewed:
+                self._schedule_save()
+        return renewed
+
+    def _expire(self):
+        """Drops entries past the retention period. Caller holds the lock. Returns the number removed."""
+        cutoff = time.time() - self.retention_days * 24 * 60 * 60
+        expired = [key for key, stamp in self._viewed.items() if stamp < cutoff]
+        for key in expired:
+            del self._viewed[key]
+        if expired:
+            print(f"Viewed list: Removed {len(expired)} entries older than {self.retention_days} days.")
+        return len(expired)
+
+    def _schedule_save(self):
+        """(Re)starts the debounce timer. Caller holds the lock."""
+        self._dirty = True
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = Timer(self.delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Writes pending changes to disk now. Safe to call from the timer and the UI thread at once."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty: # Also after another flush wrote everything while we waited
+                    return
+                self._expire()
+                snapshot = dict(self._viewed)
+                self._dirty = False
+            save_viewed(snapshot)
+
+
+def load_feed_cache():
+    """Loads the per-feed conditional GET cache (dict keyed by feed URL)."""
+    if not os.path.exists(FEED_CACHE_FILE):
+        return {}
+    try:
+        with open(FEED_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache_data = json.load(f)
+            return cache_data if isinstance(cache_data, dict) else {}
+    except (json.JSONDecodeError, FileNotFoundError):
+        print(f"Warning: Error reading {FEED_CACHE_FILE}. Starting with an empty cache.")
+        return {}
+    except Exception as e:
+        print(f"Error loading feed cache: {e}")
+        return {}
+
+def save_feed_cache(cache_data):
+    """Saves the per-feed conditional GET cache to the JSON file."""
+    try:
+        write_json_atomic(FEED_CACHE_FILE, cache_data) # No indentation, this file can get large
+    except Exception as e:
+        print(f"Error saving feed cache: {e}")
+
+
+def load_feed_health():
+    """Loads the per-feed failure history (dict keyed by feed URL)."""
+    if not os.path.exists(FEED_HEALTH_FILE):
+        return {}
+    try:
+        with open(FEED_HEALTH_FILE, 'r', encoding='utf-8') as f:
+            health_data = json.load(f)
+            return health_data if isinstance(health_data, dict) else {}
+    except (json.JSONDecodeError, FileNotFoundError):
+        print(f"Warning: Error reading {FEED_HEALTH_FILE}. Starting with a clean failure history.")
+        return {}
+    except Exception as e:
+        print(f"Error loading feed health: {e}")
+        return {}
+
+def save_feed_health(health_data):
+    """Saves the per-feed failure history to the JSON file."""
+    try:
+        write_json_atomic(FEED_HEALTH_FILE, health_data, indent=4)
+    except Exception as e:
+        print(f"Error saving feed health: {e}")
+
+
+# --- Video Records ---
+
+class VideoRecord:
+    """
+    One video. Slotted so tens of thousands of them stay small: the publish time is an integer
+    UTC epoch (None if unknown) and the channel title and feed URL are interned, so all videos
+    of a channel share one string. Display text is only formatted when a row shows the video.
+    """
+    __slots__ = ("id", "title", "link", "published", "channel_title", "feed_url", "thumbnail", "published_text")
+
+    def __init__(self, id, title="No Title", link="#", published=None, channel_title="Unknown Channel",
+                 feed_url=None, thumbnail=None, published_text=None):
+        self.id = id
+        self.title = title
+        self.link = link
+        self.published = published
+        self.channel_title = sys.intern(channel_title or "Unknown Channel")
+        self.feed_url = sys.intern(feed_url) if feed_url else None
+        self.thumbnail = thumbnail
+        self.published_text = published_text # Raw date of entries whose date couldn't be parsed
+
+    def set_source(self, channel_title, feed_url):
+        """Files the video under the stored channel name and feed URL."""
+        self.channel_title = sys.intern(channel_title or "Unknown Channel")
+        self.feed_url = sys.intern(feed_url)
+
+    @property
+    def published_str(self):
+        if self.published is None:
+            return self.published_text or "Unknown date"
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.published))
+
+    def same_display(self, other):
+        """True if other would render exactly like this video."""
+        return (self.title == other.title and self.channel_title == other.channel_title
+                and self.published == other.published and self.published_text == other.published_text
+                and self.link == other.link and self.thumbnail == other.thumbnail)
+
+
+# --- Local Video Database ---
+
+class VideoStore:
+    """
+    SQLite store of every video ever fetched, indexed by ID, channel and publish time.
+    Lets the UI render instantly on launch and keeps history beyond videos_per_channel.
+    """
+    def __init__(self, path=VIDEO_DB_FILE):
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False) # Shared by the UI and fetch threads
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS videos (
+                    id TEXT PRIMARY KEY,
+                    feed_url TEXT NOT NULL,
+                    channel_title TEXT,
+                    title TEXT,
+                    link TEXT,
+                    published REAL,
+                    published_str TEXT,
+                    fetched REAL,
+                    thumbnail TEXT
+                )""")
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(videos)")}
+            if "thumbnail" not in columns: # Databases created before thumbnails were stored
+                self._conn.execute("ALTER TABLE videos ADD COLUMN thumbnail TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_feed ON videos (feed_url, published DESC)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_channel ON videos (channel_title)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_published ON videos (published DESC)")
+
+    def upsert(self, videos):
+        """Inserts or updates fetched videos (VideoRecords as produced by FeedFetcher)."""
+        now = time.time()
+        rows = [(
+            video.id, video.feed_url, video.channel_title, video.title, video.link,
+            video.published, video.published_text, now, video.thumbnail,
+        ) for video in videos if video.id and video.feed_url]
+        if not rows:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany("""
+                    INSERT INTO videos (id, feed_url, channel_title, title, link, published, published_str, fetched, thumbnail)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        feed_url = excluded.feed_url, channel_title = excluded.channel_title,
+                        title = excluded.title, link = excluded.link, published = excluded.published,
+                        published_str = excluded.published_str, fetched = excluded.fetched,
+                        thumbnail = excluded.thumbnail""", rows)
+        except sqlite3.Error as e:
+            print(f"Error saving videos to {VIDEO_DB_FILE}: {e}")
+
+    def load_recent(self, feed_urls, limit=DEFAULT_VIDEOS_PER_CHANNEL):
+        """
+        Returns the newest `limit` stored videos of each feed in feed_urls,
+        merged and sorted newest first like FeedFetcher.fetch_all.
+        """
+        feed_urls = list(feed_urls)
+        if not feed_urls:
+            return []
+        placeholders = ",".join("?" * len(feed_urls))
+        try:
+            with self._lock:
+                rows = self._conn.execute(f"""
+                    SELECT id, feed_url, channel_title, title, link, published, published_str, thumbnail FROM (
+                        SELECT *, ROW_NUMBER() OVER (PARTITION BY feed_url ORDER BY published DESC) AS rank
+                        FROM videos WHERE feed_url IN ({placeholders})
+                    ) WHERE rank <= ?
+                    ORDER BY published IS NULL, published DESC""", (*feed_urls, limit)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error reading videos from {VIDEO_DB_FILE}: {e}")
+            return []
+        # published_str only holds unparsed dates now (older rows have formatted ones too)
+        return [VideoRecord(
+            video_id, title or "No Title", link or "#", int(published) if published is not None else None,
+            channel_title, feed_url, thumbnail, published_str if published is None else None,
+        ) for video_id, feed_url, channel_title, title, link, published, published_str, thumbnail in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --- Fetch Instrumentation ---
+
+class _TimedConnectionMixin:
+    """Records DNS, TCP connect and TLS handshake durations (ms) of an http.client connection into `timings`."""
+    def __init__(self, *args, timings=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = timings if timings is not None else {}
+        self._create_connection = self._timed_create_connection
+
+    def _timed_create_connection(self, address, timeout, source_address=None):
+        host, port = address
+        start = time.perf_counter()
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        self.timings["dns_ms"] = (resolved - start) * 1000
+        error = None
+        for family, sock_type, proto, _, sockaddr in addresses:
+            try:
+                sock = socket.create_connection(sockaddr[:2], timeout, source_address)
+            except OSError as e:
+                error = e
+                continue
+            self.timings["connect_ms"] = (time.perf_counter() - resolved) * 1000
+            return sock
+        raise error or OSError(f"getaddrinfo returned no addresses for {host}")
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        total_ms = (time.perf_counter() - start) * 1000
+        if isinstance(self, http.client.HTTPSConnection): # Whatever isn't DNS/TCP is the TLS handshake
+            self.timings["tls_ms"] = max(total_ms - self.timings.get("dns_ms", 0) - self.timings.get("connect_ms", 0), 0)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, http.client.HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, http.client.HTTPSConnection):
+    pass
+
+
+class _TimedHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(functools.partial(_TimedHTTPConnection, timings=getattr(req, "timings", None)), req)
+
+
+class _TimedHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(functools.partial(_TimedHTTPSConnection, timings=getattr(req, "timings", None)), req,
+                            context=self._context)
+
+
+_timed_opener = urllib.request.build_opener(_TimedHTTPHandler, _TimedHTTPSHandler)
+
+
+class FetchMetrics:
+    """
+    Thread-safe record of the latest fetch of every feed (phase durations, bytes, status,
+    entries, cache hit/miss) plus aggregate refresh and render timings.
+    Exported as JSON or Prometheus text format.
+    """
+    TIMING_FIELDS = ("dns_ms", "connect_ms", "tls_ms", "wait_ms", "transfer_ms", "parse_ms", "total_ms")
+
+    def __init__(self):
+        self._lock = Lock()
+        self.feeds = {} # url -> latest fetch record
+        self.last_refresh = None # {"started", "seconds", "feeds", "errors", "timed_out", "render_ms"}
+
+    def record_fetch(self, record):
+        with self._lock:
+            self.feeds[record["url"]] = record
+
+    def record_refresh(self, started, seconds, feeds, errors, timed_out=0):
+        with self._lock:
+            self.last_refresh = {"started": started, "seconds": seconds, "feeds": feeds, "errors": errors,
+                                 "timed_out": timed_out, "render_ms": None}
+
+    def record_render(self, render_ms):
+        with self._lock:
+            if self.last_refresh is not None:
+                self.last_refresh["render_ms"] = render_ms
+
+    def snapshot(self):
+        """Returns ([fetch records], last refresh) copies safe to use on another thread."""
+        with self._lock:
+            return [dict(record) for record in self.feeds.values()], dict(self.last_refresh) if self.last_refresh else None
+
+    def to_json(self):
+        feeds, last_refresh = self.snapshot()
+        return json.dumps({"refresh": last_refresh, "feeds": feeds}, indent=2)
+
+    def to_prometheus(self):
+        feeds, last_refresh = self.snapshot()
+        def label(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        lines = [
+            "# HELP ytrss_feed_fetch_seconds Duration of each phase of the latest fetch of a feed.",
+            "# TYPE ytrss_feed_fetch_seconds gauge",
+        ]
+        for record in feeds:
+            for field in self.TIMING_FIELDS:
+                if record.get(field) is not None:
+                    lines.append(f'ytrss_feed_fetch_seconds{{url="{label(record["url"])}",phase="{field[:-3]}"}} {record[field] / 1000:.6f}')
+        for name, help_text, value in (
+            ("ytrss_feed_bytes", "Bytes received in the latest fetch of a feed.", lambda r: r.get("bytes", 0)),
+            ("ytrss_feed_http_status", "HTTP status of the latest fetch of a feed (0 if none).", lambda r: r.get("http_status") or 0),
+            ("ytrss_feed_entries", "Entries returned by the latest fetch of a feed.", lambda r: r.get("entries", 0)),
+            ("ytrss_feed_cache_hit", "1 if the latest fetch of a feed was answered from the conditional GET cache.", lambda r: int(r.get("cache") == "hit")),
+            ("ytrss_feed_error", "1 if the latest fetch of a feed failed.", lambda r: int(r.get("status") not in ("ok", "skipped"))),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            lines += [f'{name}{{url="{label(record["url"])}"}} {value(record)}' for record in feeds]
+        if last_refresh:
+            for name, help_text, value in (
+                ("ytrss_refresh_seconds", "Duration of the last full refresh.", last_refresh["seconds"]),
+                ("ytrss_refresh_feeds", "Feeds fetched by the last full refresh.", last_refresh["feeds"]),
+                ("ytrss_refresh_errors", "Feeds that failed in the last full refresh.", last_refresh["errors"]),
+                ("ytrss_refresh_timed_out", "Feeds still loading when the last full refresh hit its deadline.",
+                 last_refresh.get("timed_out", 0)),
+                ("ytrss_render_seconds", "Time spent updating the video list after the last refresh.",
+                 (last_refresh["render_ms"] or 0) / 1000),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+# --- Fast YouTube Atom Parser ---
+class ParsedFeed(dict):
+    """Dict with attribute access (feed.entries), like feedparser's FeedParserDict, without importing feedparser."""
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+YT_NS = "{http://www.youtube.com/xml/schemas/2015}"
+MEDIA_NS = "{http://search.yahoo.com/mrss/}"
+
+
+def parse_youtube_feed(data, limit=DEFAULT_VIDEOS_PER_CHANNEL):
+    """
+    Streams a YouTube channel Atom feed (bytes) and stops after `limit` entries.
+    Returns a feedparser-compatible ParsedFeed with only the fields fetch_single_feed uses.
+    Raises ValueError for anything that isn't a YouTube Atom feed, so callers can fall back to feedparser.
+    """
+    feed_info = ParsedFeed()
+    entries = []
+    path = [] # Tags of the currently open elements
+    entry = None
+    try:
+        for event, elem in ET.iterparse(io.BytesIO(data), events=("start", "end")):
+            if event == "start":
+                if not path and elem.tag != ATOM_NS + "feed":
+                    raise ValueError(f"Not an Atom feed (root is {elem.tag})")
+                path.append(elem.tag)
+                if len(path) == 2 and elem.tag == ATOM_NS + "entry":
+                    entry = ParsedFeed()
+                continue
+
+            path.pop()
+            depth = len(path) # Depth of the parent element
+            tag = elem.tag
+            if depth == 1 and entry is None: # Feed-level metadata
+                if tag == ATOM_NS + "title":
+                    feed_info["title"] = elem.text or ""
+                elif tag == ATOM_NS + "link" and elem.get("rel", "alternate") == "alternate":
+                    feed_info.setdefault("link", elem.get("href"))
+            elif depth == 2 and entry is not None: # Direct children of <entry>
+                if tag == ATOM_NS + "id":
+                    entry["id"] = elem.text
+                elif tag == YT_NS + "videoId":
+                    entry["yt_videoid"] = elem.text
+                elif tag == ATOM_NS + "title":
+                    entry["title"] = elem.text or ""
+                elif tag == ATOM_NS + "link" and elem.get("rel", "alternate") == "alternate":
+                    entry.setdefault("link", elem.get("href"))
+                elif tag == ATOM_NS + "published" and elem.text:
+                    entry["published"] = elem.text
+                    entry["published_epoch"] = _parse_atom_date(elem.text)
+            elif depth == 3 and entry is not None and tag == MEDIA_NS + "thumbnail" and elem.get("url"):
+                entry["media_thumbnail"] = [{"url": elem.get("url")}] # Same shape as feedparser's
+            elif depth == 1 and tag == ATOM_NS + "entry":
+                if "yt_videoid" not in entry:
+                    raise ValueError("Entry without yt:videoId, not a YouTube feed")
+                entries.append(entry)
+                entry = None
+                elem.clear() # Keep memory flat
+                if len(entries) >= limit:
+                    break # The rest of the feed is never parsed
+    except ET.ParseError as e:
+        raise ValueError(f"Malformed XML: {e}") from e
+    if "title" not in feed_info:
+        raise ValueError("Feed without a title")
+    return ParsedFeed(feed=feed_info, entries=entries, bozo=0)
+
+
+def _parse_atom_date(text):
+    """Converts an RFC 3339 timestamp to integer UTC epoch seconds."""
+    try:
+        dt = datetime.fromisoformat(text.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def entry_epoch(entry):
+    """UTC epoch seconds of a parsed entry's publish date (from either parser), or None."""
+    published = entry.get("published_epoch")
+    if published is None and entry.get("published_parsed"):
+        published = calendar.timegm(entry["published_parsed"]) # feedparser's struct_time is UTC
+    return published
+
+
+# --- HTTP Transports ---
+
+def _read_body(response, deadline):
+    """Reads a response body in chunks, giving up with TimeoutError once deadline (time.monotonic()) has passed."""
+    chunks = []
+    while True:
+        chunk = response.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+        if time.monotonic() > deadline:
+            raise TimeoutError("Feed download took longer than the feed timeout")
+
+
+def _record_phase_timings(timings, start, headers_received, done):
+    """Splits a request's duration into wait (minus any connection setup) and transfer time."""
+    connection_ms = sum(timings.get(field, 0) for field in ("dns_ms", "connect_ms", "tls_ms"))
+    timings["wait_ms"] = max((headers_received - start) * 1000 - connection_ms, 0)
+    timings["transfer_ms"] = (done - headers_received) * 1000
+
+
+class UrllibTransport:
+    """
+    Plain urllib: a new connection (and TLS handshake) for every request. Follows redirects
+    and honours the system proxy settings.
+    A transport's request(url, headers, timeout, timings) returns (status, body bytes, response headers);
+    timeout bounds the whole request, not just each socket operation.
+    """
+    def request(self, url, headers, timeout, timings):
+        deadline = time.monotonic() + timeout
+        request = urllib.request.Request(url, headers=headers)
+        request.timings = timings # Filled in by the timed connection
+        timings["connection"] = "new"
+        start = time.perf_counter()
+        try:
+            with _timed_opener.open(request, timeout=timeout) as response:
+                headers_received = time.perf_counter()
+                status, body, response_headers = response.status, _read_body(response, deadline), response.headers
+        except urllib.error.HTTPError as e:
+            headers_received = time.perf_counter()
+            status, body, response_headers = e.code, b"", e.headers
+        _record_phase_timings(timings, start, headers_received, time.perf_counter())
+        return status, body, response_headers
+
+    def close(self):
+        pass
+
+
+class PooledTransport:
+    """
+    Keeps HTTP/1.1 connections open and reuses them for later requests to the same host,
+    so only the first feed per connection pays for DNS, TCP connect and the TLS handshake.
+    At most max_idle_per_host idle connections are kept per host, each for up to POOL_IDLE_TIMEOUT.
+    """
+    def __init__(self, max_idle_per_host=DEFAULT_PER_HOST_CONNECTIONS):
+        self.max_idle_per_host = max(1, max_idle_per_host)
+        self._idle = {} # (scheme, host, port) -> [(connection, idle since)]
+        self._lock = Lock()
+        self._ssl_context = None # Created for the first https connection; loading the CA certificates is slow
+
+    def request(self, url, headers, timeout, timings):
+        deadline = time.monotonic() + timeout # Shared by the redirects
+        for _ in range(MAX_REDIRECTS + 1):
+            status, body, response_headers = self._request_once(url, headers, deadline, timings)
+            location = response_headers.get("Location")
+            if status not in (301, 302, 303, 307, 308) or not location:
+                return status, body, response_headers
+            url = urljoin(url, location)
+        raise urllib.error.URLError(f"Too many redirects (last: {url})")
+
+    def _request_once(self, url, headers, deadline, timings):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        headers = {"Host": parts.netloc, "Connection": "keep-alive", **headers}
+        for attempt in range(2):
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                raise TimeoutError("Feed download took longer than the feed timeout")
+            connection, reused = self._checkout(key, timeout, timings)
+            timings["connection"] = "reused" if reused else "new"
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                headers_received = time.perf_counter()
+                body = _read_body(response, deadline)
+            except (ConnectionError, http.client.BadStatusLine):
+                connection.close()
+                if reused and attempt == 0:
+                    continue # The server dropped the idle connection meanwhile: retry on a fresh one
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            _record_phase_timings(timings, start, headers_received, time.perf_counter())
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(key, connection)
+            return response.status, body, response.headers
+
+    def _checkout(self, key, timeout, timings):
+        """Returns (connection, reused): an idle connection to the host, or a new unconnected one."""
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                connection, idle_since = idle.pop()
+                if now - idle_since < POOL_IDLE_TIMEOUT and connection.sock is not None:
+                    connection.timings = timings
+                    connection.timeout = timeout
+                    connection.sock.settimeout(timeout) # Per-request timeout on a reused socket
+                    return connection, True
+                connection.close()
+        scheme, host, port = key
+        if scheme == "https":
+            with self._lock:
+                if self._ssl_context is None:
+                    self._ssl_context = ssl.create_default_context()
+            return _TimedHTTPSConnection(host, port, timeout=timeout, context=self._ssl_context, timings=timings), False
+        return _TimedHTTPConnection(host, port, timeout=timeout, timings=timings), False
+
+    def _checkin(self, key, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def close(self):
+        """Closes every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+
+
+def decode_content(body, encoding):
+    """Undoes a gzip or deflate Content-Encoding."""
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body) # zlib wrapped, as the spec says
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS) # Raw deflate, as some servers send it
+    return body
+
+
+def download_feed(rss_url, etag=None, modified=None, timings=None, transport=None, timeout=FETCH_TIMEOUT):
+    """
+    Downloads a feed with conditional GET headers through transport (a new urllib connection if None).
+    Returns (status, body bytes, response headers); a 304 comes back with an empty body.
+    If given, the timings dict receives dns/connect/tls/wait/transfer durations (ms), bytes, http_status
+    and whether the connection was new or reused.
+    """
+    timings = timings if timings is not None else {}
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+    if etag: headers["If-None-Match"] = etag
+    if modified: headers["If-Modified-Since"] = modified
+    status, body, response_headers = (transport or _urllib_transport).request(rss_url, headers, timeout, timings)
+    timings["bytes"] = len(body)
+    timings["http_status"] = status
+    return status, decode_content(body, response_headers.get("Content-Encoding")), response_headers
+
+
+_urllib_transport = UrllibTransport()
+
+
+# --- Search Index ---
+
+_TOKEN_RE = re.compile(r"\w+")
+
+def tokenize(text):
+    """Lower-cased word tokens of text."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class VideoIndex:
+    """
+    Inverted index over video title and channel tokens, plus a channel facet.
+    update() only touches videos that were added, removed or changed since the last call.
+    """
+    def __init__(self):
+        self.videos = {} # id -> VideoRecord
+        self.postings = {} # token -> set of ids
+        self.short_prefixes = {} # SEARCH_MIN_PREFIX-long token prefix -> set of ids, for the first keystrokes
+        self.channels = {} # channel title -> set of ids
+        self._vocabulary = [] # Sorted tokens for prefix lookups, rebuilt lazily
+        self._vocabulary_dirty = False
+
+    def update(self, videos):
+        """Makes the index reflect exactly `videos`. Returns True if anything changed."""
+        current = {video.id: video for video in videos if video.id}
+        changed = False
+        for video_id in [video_id for video_id in self.videos if video_id not in current]:
+            self._remove(video_id); changed = True
+        for video_id, video in current.items():
+            indexed = self.videos.get(video_id)
+            if indexed is video:
+                continue
+            if indexed is not None:
+                if indexed.title == video.title and indexed.channel_title == video.channel_title:
+                    self.videos[video_id] = video # Same text, no reindexing needed
+                    continue
+                self._remove(video_id)
+            self._add(video_id, video); changed = True
+        return changed
+
+    def _index_tokens(self, video):
+        return set(tokenize(video.title)) | set(tokenize(video.channel_title))
+
+    def _add(self, video_id, video):
+        self.videos[video_id] = video
+        for token in self._index_tokens(video):
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                self._vocabulary_dirty = True
+            ids.add(video_id)
+            if len(token) >= SEARCH_MIN_PREFIX:
+                self.short_prefixes.setdefault(token[:SEARCH_MIN_PREFIX], set()).add(video_id)
+        self.channels.setdefault(video.channel_title, set()).add(video_id)
+
+    def _remove(self, video_id):
+        video = self.videos.pop(video_id)
+        for token in self._index_tokens(video):
+            ids = self.postings.get(token)
+            if ids is not None:
+                ids.discard(video_id)
+                if not ids:
+                    del self.postings[token]
+                    self._vocabulary_dirty = True
+            prefix_ids = self.short_prefixes.get(token[:SEARCH_MIN_PREFIX])
+            if prefix_ids is not None and len(token) >= SEARCH_MIN_PREFIX:
+                prefix_ids.discard(video_id) # All of this video's tokens go, so no other token keeps it
+                if not prefix_ids: del self.short_prefixes[token[:SEARCH_MIN_PREFIX]]
+        channel = video.channel_title
+        ids = self.channels.get(channel)
+        if ids is not None:
+            ids.discard(video_id)
+            if not ids: del self.channels[channel]
+
+    def _prefix_ids(self, prefix):
+        """IDs of videos with any token starting with prefix."""
+        if len(prefix) == SEARCH_MIN_PREFIX:
+            return self.short_prefixes.get(prefix, set())
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        matching = []
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            matching.append(self.postings[token])
+        return set().union(*matching)
+
+    def channel_names(self):
+        return sorted(self.channels, key=str.lower)
+
+    def search(self, query="", channel=None):
+        """
+        Returns the (read-only) set of matching IDs, or None when no filter is active.
+        Every query word must match; the last one matches as a prefix (search as you type). While
+        it is shorter than SEARCH_MIN_PREFIX it is left out, so starting a new word doesn't empty the list.
+        """
+        words = tokenize(query)
+        if words and len(words[-1]) < SEARCH_MIN_PREFIX:
+            words = words[:-1]
+        if not words and channel is None:
+            return None
+        candidates = []
+        if channel is not None:
+            candidates.append(self.channels.get(channel, set()))
+        for word in words[:-1]:
+            candidates.append(self.postings.get(word, set()))
+        if words:
+            candidates.append(self._prefix_ids(words[-1]))
+        if len(candidates) == 1:
+            return candidates[0] # Callers only read the result, no need to copy
+        candidates.sort(key=len) # Intersect starting from the smallest set
+        return candidates[0].intersection(*candidates[1:])
+
+
+# --- Feed Parse Stage ---
+
+def parse_feed_bytes(data, limit, url=""):
+    """
+    Turns a downloaded feed into (title, link, entries), entries being compact
+    (id, title, link, published epoch, unparsed date text, thumbnail URL) tuples, or None if
+    nothing could be parsed. Uses the fast YouTube parser and falls back to feedparser.
+    May run in a worker process, so it only takes and returns plain picklable values.
+    """
+    try:
+        feed = parse_youtube_feed(data, limit)
+    except ValueError as e:
+        print(f"Fast parser declined {url} ({e}), using feedparser.")
+        import feedparser # Only needed for feeds the fast parser declines
+        feed = feedparser.parse(data)
+        if feed.bozo:
+            print(f"Warning: Feedparser issues with {url}. Bozo: {feed.get('bozo_exception', 'Unknown issue')}")
+    if not feed.entries and not feed.feed:
+        return None
+    entries = []
+    for entry in feed.entries[:limit]:
+        video_id = entry.get("id", entry.get("link"))
+        if not video_id: continue # Skip if no ID
+        published = entry_epoch(entry)
+        thumbnails = entry.get("media_thumbnail") or [{}]
+        entries.append((video_id, entry.get("title", "No Title"), entry.get("link", "#"), published,
+                        entry.get("published") if published is None else None, thumbnails[0].get("url")))
+    return feed.feed.get("title", "Unknown Channel"), feed.feed.get("link"), entries
+
+
+class ParsePool:
+    """
+    Parse stage of the fetch pipeline. With offload=True the raw feed bytes go to a pool of
+    worker processes, so large refreshes parse on every core instead of under one GIL.
+    Otherwise (small batches, single polls) parsing happens in the calling thread.
+    """
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._lock = Lock()
+
+    def parse(self, data, limit, url="", offload=False):
+        pool = self._get_pool() if offload and self.workers > 1 else None
+        if pool is not None:
+            from concurrent.futures.process import BrokenProcessPool # Already imported by _get_pool
+            try:
+                return pool.submit(parse_feed_bytes, data, limit, url).result()
+            except BrokenProcessPool as e:
+                print(f"Parse worker process failed ({e}), parsing in-process from now on.")
+                self.workers = 1
+        return parse_feed_bytes(data, limit, url)
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None and self.workers > 1:
+                try: # spawn, not fork: forking while fetch threads hold locks can deadlock the children
+                    import multiprocessing
+                    from concurrent.futures import ProcessPoolExecutor
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+                except (OSError, NotImplementedError, ImportError) as e:
+                    print(f"Could not start parse worker processes ({e}), parsing in-process.")
+                    self.workers = 1
+            return self._pool
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# --- Feed Health (Circuit Breaker) ---
+
+class FeedHealth:
+    """
+    Per-feed failure history with a circuit breaker. A feed is "closed" (fetched normally) until
+    BREAKER_FAILURE_THRESHOLD fetches in a row fail; then it is "open" and refreshes skip it for a
+    cooldown that doubles with every further failure. Once the cooldown is over it is "half-open":
+    a single trial fetch either closes it again or reopens it for longer.
+    Only healthy feeds are missing from entries, so the saved file stays small.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, entries=None):
+        # {url: {"failures", "last_error", "last_failure", "retry_at"}}, epoch seconds
+        self.entries = entries if entries is not None else {}
+        self._trials = set() # Half-open feeds with a trial fetch in flight
+        self._lock = Lock()
+        self._dirty = False
+
+    def _state(self, entry, now):
+        if entry is None or entry.get("failures", 0) < BREAKER_FAILURE_THRESHOLD:
+            return self.CLOSED
+        return self.OPEN if now < entry.get("retry_at", 0) else self.HALF_OPEN
+
+    def state(self, url, now=None):
+        """Returns (state, entry copy or None) for url."""
+        with self._lock:
+            entry = self.entries.get(url)
+            return self._state(entry, now or time.time()), dict(entry) if entry else None
+
+    def allow(self, url, now=None):
+        """True if url should be fetched now; a half-open feed lets one trial fetch through at a time."""
+        with self._lock:
+            state = self._state(self.entries.get(url), now or time.time())
+            if state == self.CLOSED:
+                return True
+            if state == self.OPEN or url in self._trials:
+                return False
+            self._trials.add(url)
+            return True
+
+    def record_success(self, url):
+        with self._lock:
+            self._trials.discard(url)
+            entry = self.entries.pop(url, None)
+            if entry is not None:
+                self._dirty = True
+                if entry.get("failures", 0) >= BREAKER_FAILURE_THRESHOLD:
+                    print(f"Feed recovered, fetching it again: {url}")
+
+    def record_failure(self, url, error, now=None):
+        now = now or time.time()
+        with self._lock:
+            self._trials.discard(url)
+            entry = self.entries.setdefault(url, {"failures": 0})
+            entry["failures"] += 1
+            entry["last_error"] = error
+            entry["last_failure"] = int(now)
+            if entry["failures"] >= BREAKER_FAILURE_THRESHOLD:
+                cooldown = min(BREAKER_BASE_COOLDOWN * 2 ** (entry["failures"] - BREAKER_FAILURE_THRESHOLD), BREAKER_MAX_COOLDOWN)
+                entry["retry_at"] = int(now + cooldown)
+                print(f"Feed failed {entry['failures']} times in a row, skipping it for {int(cooldown // 60)} min: {url}")
+            self._dirty = True
+
+    def release(self, url):
+        """Ends a trial fetch that neither succeeded nor failed (e.g. the network was down)."""
+        with self._lock:
+            self._trials.discard(url)
+
+    def reset(self, url):
+        """Forgets url's failures, so the next refresh fetches it."""
+        with self._lock:
+            self._trials.discard(url)
+            if self.entries.pop(url, None) is not None:
+                self._dirty = True
+
+    def paused_count(self, urls, now=None):
+        """Number of urls whose circuit is open or half-open."""
+        now = now or time.time()
+        with self._lock:
+            return sum(1 for url in urls if self._state(self.entries.get(url), now) != self.CLOSED)
+
+    def prune(self, urls):
+        """Forgets every feed not in urls."""
+        with self._lock:
+            for url in [url for url in self.entries if url not in urls]:
+                del self.entries[url]
+                self._dirty = True
+
+    def snapshot_if_dirty(self):
+        """Returns a copy of the entries if they changed since the last call, else None."""
+        with self._lock:
+            if not self._dirty:
+                return None
+            self._dirty = False
+            return {url: dict(entry) for url, entry in self.entries.items()}
+
+
+# --- Concurrent Feed Fetching Engine ---
+
+def video_sort_key(video):
+    """Key for sorting newest first (with reverse=True). Undated videos go last and are never compared by date."""
+    published = video.published
+    return (published is not None, published or 0)
+
+
+def merge_newest_first(*video_lists):
+    """Lazily k-way merges lists that are each sorted newest first into one newest-first stream."""
+    return heapq.merge(*video_lists, key=video_sort_key, reverse=True)
+
+
+class FeedFetcher:
+    """
+    Fetches YouTube RSS feeds concurrently with a bounded worker pool.
+    Requests to the same host are additionally limited by a per-host semaphore.
+    Downloads go through transport; by default a PooledTransport that reuses connections
+    (or plain urllib when a proxy is configured, which only urllib honours).
+    Feeds that keep failing are tracked in health (a FeedHealth) and skipped by refreshes.
+    Each download is abandoned after feed_timeout seconds.
+    """
+    def __init__(self, max_workers=DEFAULT_FETCH_WORKERS, per_host_connections=DEFAULT_PER_HOST_CONNECTIONS, cache=None,
+                 transport=None, health=None, feed_timeout=FETCH_TIMEOUT):
+        self.metrics = FetchMetrics()
+        self.feed_timeout = feed_timeout
+        self.max_workers = max(1, max_workers)
+        self.per_host_connections = max(1, per_host_connections)
+        if transport is None:
+            proxies = urllib.request.getproxies()
+            transport = UrllibTransport() if proxies.get("http") or proxies.get("https") else PooledTransport(self.per_host_connections)
+        self.transport = transport
+        self.parse_pool = ParsePool(min(os.cpu_count() or 1, self.max_workers)) # More would just wait for downloads
+        self._host_semaphores = {}
+        self._host_lock = Lock()
+        # Conditional GET cache: {url: {"etag", "modified", "limit", "feed_title", "feed_link", "entries"}}
+        self.cache = cache if cache is not None else {}
+        self._cache_lock = Lock()
+        self._save_lock = Lock() # One writer of the cache files at a time, newest snapshot last
+        self._cache_dirty = False
+        self.health = health if health is not None else FeedHealth()
+        self._last_success = None # time.monotonic() of the latest successful fetch, proof that we are online
+
+    def _host_semaphore(self, rss_url):
+        """Returns the semaphore limiting concurrent requests to the feed's host."""
+        host = urlsplit(rss_url).netloc.lower()
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = BoundedSemaphore(self.per_host_connections)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def fetch_single_feed(self, rss_url, limit=DEFAULT_VIDEOS_PER_CHANNEL, offload=False, skip_open=False, track=True,
+                          unreachable=None):
+        """
+        Fetches and parses a single RSS feed, limiting entries.
+        Returns a dictionary with feed details and entries, or None on error.
+        offload=True parses in the process pool. The fetch is recorded in self.metrics and the
+        feed's health, unless track=False (feeds being validated, which may never be added).
+        skip_open=True doesn't contact feeds whose circuit is open: their last cached
+        entries are returned instead, marked "skipped".
+        If given, the list unreachable collects (url, error) of feeds that failed with a connection error,
+        for the caller to count once it knows whether any feed could be reached (see settle_unreachable).
+        """
+        record = {"url": rss_url, "started": time.time()}
+        start = time.perf_counter()
+        if skip_open and not self.health.allow(rss_url):
+            result = self._skipped_result(rss_url, limit, record)
+        else:
+            result = self._fetch_single_feed(rss_url, limit, record, offload)
+            if track: self._update_health(rss_url, result, unreachable)
+        record["total_ms"] = (time.perf_counter() - start) * 1000
+        record["status"] = "skipped" if result.get("skipped") else result.get("status", "error") if result else "error"
+        record["entries"] = len(result.get("posts", [])) if result else 0
+        record["cache"] = "hit" if result and result.get("cached") else "miss"
+        if record["status"] not in ("ok", "skipped"):
+            record.setdefault("error", result.get("Feed Title") if result else "Unknown error")
+        if track: self.metrics.record_fetch(record)
+        return result
+
+    def _update_health(self, rss_url, result, unreachable=None):
+        """
+        Feeds the fetch outcome to the circuit breaker. Timeouts of a host that accepted the connection
+        count right away. Other connection errors are also what being offline looks like, so they only count
+        once another feed was reached: in the same batch (unreachable, see settle_unreachable) or, for single
+        fetches, within BREAKER_ONLINE_WINDOW.
+        """
+        error = result.get("Feed Title") if result else "Unknown error"
+        if result and result.get("status") == "ok":
+            self._last_success = time.monotonic()
+            self.health.record_success(rss_url)
+        elif result and result.get("error_kind") == "connection":
+            self.health.release(rss_url) # Ends a half-open trial; the failure may still be recorded below
+            if unreachable is not None:
+                unreachable.append((rss_url, error))
+            elif self._last_success is not None and time.monotonic() - self._last_success < BREAKER_ONLINE_WINDOW:
+                self.health.record_failure(rss_url, error)
+        else:
+            self.health.record_failure(rss_url, error)
+
+    def settle_unreachable(self, unreachable, reached):
+        """Counts a batch's connection failures against their feeds if any feed of the batch was reached (reached=True)."""
+        if not unreachable:
+            return
+        if not reached:
+            print(f"No feed could be reached, not counting {len(unreachable)} connection errors (offline?).")
+            return
+        for rss_url, error in unreachable:
+            self.health.record_failure(rss_url, error)
+
+    def _skipped_result(self, rss_url, limit, record):
+        """
+        Stands in for a feed whose circuit is open: its last cached entries. Without any (the server
+        sends no validators, so nothing was cached) it is a failed result, so callers keep the videos they have.
+        """
+        _, entry = self.health.state(rss_url)
+        retry_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["retry_at"])) if entry else "later"
+        record["error"] = f"Skipped after {entry['failures'] if entry else 0} failures, retry at {retry_at}"
+        with self._cache_lock:
+            cached = self.cache.get(rss_url)
+        if cached:
+            result = self._posts_from_cache(cached, limit)
+        else:
+            result = {"Feed Title": record["error"], "Feed Link": rss_url, "status": "error", "posts": []}
+        result["skipped"] = True
+        return result
+
+    def _fetch_single_feed(self, rss_url, limit, record, offload=False):
+        print(f"Fetching: {rss_url}")
+        try:
+            with self._cache_lock:
+                cached = self.cache.get(rss_url)
+            # Only revalidate if the cached copy holds enough entries for the current limit
+            if cached and cached.get("limit", 0) < limit:
+                cached = None
+            etag = cached.get("etag") if cached else None
+            modified = cached.get("modified") if cached else None
+
+            # Download stage: holds one of the host's connection slots
+            with self._host_semaphore(rss_url):
+                try:
+                    status, body, headers = download_feed(rss_url, etag, modified, timings=record, transport=self.transport,
+                                                          timeout=self.feed_timeout)
+                except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError, zlib.error) as e:
+                    record["error"] = str(e)
+                    print(f"Error downloading {rss_url}: {e}")
+                    # A host that accepted the connection but didn't answer in time is at fault itself
+                    connected = "connect_ms" in record or record.get("connection") == "reused"
+                    timed_out = isinstance(e, TimeoutError) or isinstance(getattr(e, "reason", None), TimeoutError)
+                    return {"Feed Title": f"Connection Error: {e}", "posts": [], "Feed Link": rss_url, "status": "error",
+                            "error_kind": "timeout" if connected and timed_out else "connection"}
+
+            if status == 304 and cached:
+                return self._posts_from_cache(cached, limit)
+            if status != 200:
+                print(f"HTTP Error {status} for feed: {rss_url}")
+                return {"Feed Title": f"HTTP Error {status}", "posts": [], "Feed Link": rss_url, "status": "error", "error_kind": "http"}
+
+            # Parse stage: in a worker process for large refreshes
+            parse_start = time.perf_counter()
+            parsed = self.parse_pool.parse(body, limit, rss_url, offload=offload) if body else None
+            record["parse_ms"] = (time.perf_counter() - parse_start) * 1000
+            if parsed is None:
+                 print(f"Error: Feed seems empty or parsing failed for {rss_url}.")
+                 return {"Feed Title": f"Empty/Failed Parse {rss_url}", "posts": [], "Feed Link": rss_url, "status": "error", "error_kind": "parse"}
+
+            feed_title, feed_link, entries = parsed
+            posts_details = {"Feed Title": feed_title, "Feed Link": feed_link or rss_url, "status": "ok"}
+            posts_details["posts"] = [VideoRecord(
+                video_id, title, link, published,
+                feed_title, # This will be overwritten later by stored name
+                thumbnail=thumbnail, published_text=published_text,
+            ) for video_id, title, link, published, published_text, thumbnail in entries]
+            self._store_in_cache(rss_url, headers.get("ETag"), headers.get("Last-Modified"), limit, posts_details)
+            return posts_details
+
+        except Exception as e:
+            import traceback
+            print(f"Critical Error fetching/parsing feed {rss_url}: {e}")
+            traceback.print_exc()
+            return {"Feed Title": f"Error Parsing {rss_url}", "posts": [], "Feed Link": rss_url, "status": "error", "error_kind": "parse"}
+
+    def _store_in_cache(self, rss_url, etag, modified, limit, posts_details):
+        """Remembers the validators and parsed entries of a successful fetch."""
+        if not etag and not modified:
+            return # Server gave nothing to revalidate with
+        entries = [{
+            "title": post.title, "link": post.link, "id": post.id, "published": post.published,
+            "published_text": post.published_text, "thumbnail": post.thumbnail,
+        } for post in posts_details["posts"]]
+        with self._cache_lock:
+            self.cache[rss_url] = {
+                "etag": etag, "modified": modified, "limit": limit,
+                "feed_title": posts_details["Feed Title"], "feed_link": posts_details["Feed Link"],
+                "entries": entries,
+            }
+            self._cache_dirty = True
+
+    def _posts_from_cache(self, cached, limit):
+        """Rebuilds a fetch result from cached entries after a 304 Not Modified."""
+        feed_title = cached.get("feed_title", "Unknown Channel")
+        processed_entries = []
+        for entry in cached.get("entries", [])[:limit]:
+            published = entry.get("published")
+            processed_entries.append(VideoRecord(
+                entry["id"], entry.get("title", "No Title"), entry.get("link", "#"),
+                int(published) if published is not None else None, feed_title,
+                thumbnail=entry.get("thumbnail"),
+                # Caches written before VideoRecord kept the formatted date in published_str
+                published_text=entry.get("published_text", entry.get("published_str")) if published is None else None,
+            ))
+        return {"Feed Title": feed_title, "Feed Link": cached.get("feed_link", ""), "status": "ok",
+                "posts": processed_entries, "cached": True}
+
+    def close(self):
+        """Closes idle connections and stops the parse worker processes."""
+        self.transport.close()
+        self.parse_pool.close()
+
+    def save_cache(self):
+        """Writes the conditional GET cache and the feed health to disk if they changed since the last save."""
+        with self._save_lock:
+            health = self.health.snapshot_if_dirty()
+            if health is not None:
+                save_feed_health(health)
+            with self._cache_lock:
+                if not self._cache_dirty:
+                    return
+                snapshot = dict(self.cache)
+                self._cache_dirty = False
+            save_feed_cache(snapshot)
+
+    def prune(self, feed_urls):
+        """
+        Drops the cache and health entries of feeds not in feed_urls (removed feeds, or feeds
+        an older version tracked while validating an import), so the files don't only grow.
+        """
+        feed_urls = set(feed_urls)
+        with self._cache_lock:
+            removed = [url for url in self.cache if url not in feed_urls]
+            for url in removed:
+                del self.cache[url]
+            if removed:
+                self._cache_dirty = True
+        self.health.prune(feed_urls)
+        return len(removed)
+
+    def resolve_feeds(self, subscriptions, limit=DEFAULT_VIDEOS_PER_CHANNEL, on_result=None):
+        """
+        Validates (url, name) subscriptions concurrently by fetching them, naming each feed after
+        its own title (falling back to the given name). on_result(url, feed_info, error) is called
+        as each one completes, from the calling thread; feed_info is None for feeds that failed.
+        These fetches don't count towards feed health or metrics: rejected feeds are never added.
+        """
+        if not subscriptions:
+            return
+        workers = min(self.max_workers, len(subscriptions))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-resolve") as pool:
+            futures = {pool.submit(self.fetch_single_feed, url, limit, track=False): (url, name) for url, name in subscriptions}
+            for future in as_completed(futures):
+                url, name = futures[future]
+                try:
+                    feed_data = future.result()
+                except Exception as e:
+                    feed_data = {"status": "error", "Feed Title": str(e)}
+                if feed_data and feed_data.get("status") == "ok":
+                    title = feed_data.get("Feed Title")
+                    if not title or title == "Unknown Channel": title = name or f"Unknown ({url})"
+                    on_result(url, {"url": url, "name": title}, None)
+                else:
+                    on_result(url, None, feed_data.get("Feed Title", "Unknown Error") if feed_data else "Unknown Error")
+        self.save_cache() # The next refresh revalidates these instead of downloading them again
+
+    def fetch_all(self, feeds_data, limit=DEFAULT_VIDEOS_PER_CHANNEL, on_feed=None, deadline=None, on_late=None):
+        """
+        Fetches every feed in feeds_data (list of {"url", "name"} dicts) concurrently.
+        Returns (videos, error_count, timed_out_urls) with the feeds' videos k-way merged newest first.
+        Feeds with an open circuit are skipped and aren't errors: their cached videos are used, or
+        on_feed gets ok=False if nothing is cached, so callers keep showing what they had.
+        If given, on_feed(url, posts, ok) is called as each feed completes, from the calling thread.
+        If deadline (seconds) passes before every feed is done, the finished ones are returned and
+        the rest listed in timed_out_urls. Those keep running in the background and are handed to
+        on_late(url, posts, ok) from their worker thread as they finish.
+        """
+        feed_names = {}
+        for feed_info in feeds_data:
+            url = feed_info.get('url')
+            if url and url not in feed_names:
+                feed_names[url] = feed_info.get('name', "Unknown Channel")
+
+        posts_by_feed = []
+        errors = skipped = 0
+        timed_out = []
+        unreachable = [] # (url, error) of feeds that failed with a connection error
+        reached = False # Whether any feed was actually fetched, i.e. we are online
+        if not feed_names:
+            return [], errors, timed_out
+
+        started = time.time()
+        start = time.perf_counter()
+
+        workers = min(self.max_workers, len(feed_names))
+        offload = len(feed_names) >= PARSE_OFFLOAD_MIN_FEEDS # Small batches aren't worth the inter-process round trips
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-fetch")
+        try:
+            futures = {pool.submit(self.fetch_single_feed, url, limit, offload, True, True, unreachable): url for url in feed_names}
+            pending = set(futures)
+            try:
+                for future in as_completed(futures, timeout=deadline):
+                    pending.discard(future)
+                    url = futures[future]
+                    posts, ok, was_skipped = self._collect_feed(url, feed_names[url], future)
+                    skipped += was_skipped
+                    reached = reached or (ok and not was_skipped)
+                    if ok:
+                        posts_by_feed.append(posts)
+                    elif not was_skipped:
+                        errors += 1
+                    if on_feed is not None:
+                        on_feed(url, posts, ok)
+            except FuturesTimeoutError:
+                print(f"Refresh deadline of {deadline} s reached, {len(pending)} feeds are still loading.")
+                for future in pending:
+                    url = futures[future]
+                    timed_out.append(url)
+                    if on_late is not None: # Runs right away if the feed finished meanwhile
+                        future.add_done_callback(lambda f, url=url: on_late(url, *self._collect_feed(url, feed_names[url], f)[:2]))
+        finally:
+            pool.shutdown(wait=False) # Stragglers finish in the background
+
+        if skipped:
+            print(f"Skipped {skipped} failing feeds (see View Feeds).")
+        # Stragglers past the deadline aren't settled: their trials were released, which is the offline-safe side
+        self.settle_unreachable(list(unreachable), reached)
+        self.save_cache()
+        # Materialized once: callers store every video and the UI indexes all of them anyway
+        all_videos_fetched = list(merge_newest_first(*posts_by_feed))
+        self.metrics.record_refresh(started, time.perf_counter() - start, len(feed_names), errors, len(timed_out))
+        return all_videos_fetched, errors, timed_out
+
+    def _collect_feed(self, url, feed_name, future):
+        """Turns a finished fetch_single_feed future into (posts newest first, ok, skipped)."""
+        try:
+            feed_data = future.result()
+        except Exception as e:
+            feed_data = None
+            print(f"Unexpected error fetching {url}: {e}")
+
+        if feed_data and feed_data.get("status") == "ok":
+            posts = []
+            for post in feed_data.get("posts", []):
+                if post.id:
+                    post.set_source(feed_name, url) # Use stored name
+                    posts.append(post)
+            posts.sort(key=video_sort_key, reverse=True) # Feeds are newest first already, this is cheap
+            return posts, True, bool(feed_data.get("skipped"))
+        if feed_data and feed_data.get("skipped"):
+            return [], False, True # Paused with nothing cached: not an error, but there are no posts to replace the old ones
+        if feed_data and feed_data.get("status") == "error":
+            print(f"Failed to process feed: {url} - {feed_data.get('Feed Title')}")
+        else:
+            print(f"Failed to process feed (unknown error): {url}")
+        return [], False, False
+
+
+# --- Adaptive Background Polling ---
+
+def poll_interval_for(published_epochs, now=None):
+    """
+    Derives a feed's poll interval (seconds) from the publish times of its recent videos:
+    a fraction of the median gap between uploads, stretched when the channel went quiet.
+    """
+    now = now if now is not None else time.time()
+    stamps = sorted((stamp for stamp in published_epochs if stamp is not None), reverse=True)
+    if len(stamps) < 2:
+        return POLL_DEFAULT_INTERVAL
+    gaps = sorted(newer - older for newer, older in zip(stamps, stamps[1:]))
+    median_gap = gaps[len(gaps) // 2]
+    interval = median_gap / POLL_CADENCE_DIVISOR
+    # A channel silent for much longer than usual is probably dormant
+    silence = now - stamps[0]
+    if silence > 2 * median_gap:
+        interval = max(interval, silence / POLL_CADENCE_DIVISOR)
+    return min(max(interval, POLL_MIN_INTERVAL), POLL_MAX_INTERVAL)
+
+
+class PollScheduler:
+    """
+    Polls feeds in the background, each on its own schedule. Next-due times live in a
+    heap; each feed's interval follows its upload cadence and backs off after errors.
+    """
+    def __init__(self, fetch, on_result):
+        self.fetch = fetch # fetch(url) -> feed_data dict, as returned by FeedFetcher.fetch_single_feed
+        self.on_result = on_result # on_result(url, feed_data), called from the polling thread
+        self._heap = [] # (due_time, url); stale entries are skipped lazily
+        self._due = {} # url -> current due_time
+        self._intervals = {} # url -> cadence-based interval, before any error backoff
+        self._errors = {} # url -> consecutive error count
+        self._cond = Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = Thread(target=self._run, name="feed-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def update_feeds(self, feed_urls, history=None):
+        """
+        Tracks exactly feed_urls. New feeds are scheduled from their publish history
+        ({url: [published epoch, ...]}); feeds no longer listed are dropped.
+        """
+        history = history or {}
+        now = time.time()
+        with self._cond:
+            for url in list(self._due):
+                if url not in feed_urls:
+                    del self._due[url]; self._intervals.pop(url, None); self._errors.pop(url, None)
+            for url in feed_urls:
+                if url not in self._due:
+                    self._schedule(url, poll_interval_for(history.get(url, []), now), now)
+            self._cond.notify_all()
+
+    def _schedule(self, url, interval, now, backoff=False):
+        """Caller holds the condition's lock."""
+        due = now + interval
+        if not backoff:
+            self._intervals[url] = interval
+        self._due[url] = due
+        heapq.heappush(self._heap, (due, url))
+
+    def _next_due_url(self):
+        """Blocks until a feed is due (returns its URL) or the scheduler stops (returns None)."""
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, url = self._heap[0]
+                if self._due.get(url) != due:
+                    heapq.heappop(self._heap) # Rescheduled or removed
+                    continue
+                wait = due - time.time()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                heapq.heappop(self._heap)
+                del self._due[url] # Not due again until rescheduled below
+                return url
+            return None
+
+    def _run(self):
+        while True:
+            url = self._next_due_url()
+            if url is None:
+                return
+            try:
+                feed_data = self.fetch(url)
+            except Exception as e:
+                print(f"Unexpected error polling {url}: {e}")
+                feed_data = None
+            ok = bool(feed_data) and feed_data.get("status") == "ok"
+            now = time.time()
+            with self._cond:
+                if url not in self._intervals:
+                    continue # Feed was removed while it was being fetched
+                if ok:
+                    self._errors.pop(url, None)
+                    interval = poll_interval_for([post.published for post in feed_data.get("posts", [])], now)
+                else:
+                    errors = self._errors.get(url, 0) + 1
+                    self._errors[url] = errors
+                    interval = min(self._intervals[url] * 2 ** errors, POLL_ERROR_BACKOFF_MAX)
+                    print(f"Polling {url} failed ({errors} in a row), next try in {int(interval // 60)} min.")
+                self._schedule(url, interval, now, backoff=not ok)
+            if ok:
+                try:
+                    self.on_result(url, feed_data)
+                except Exception as e:
+                    print(f"Error handling poll result for {url}: {e}")
+
+
+# --- Headless Aggregator Server ---
+
+def _atom_time(epoch):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+def videos_to_json(videos):
+    """The served video list as JSON (bytes)."""
+    return json.dumps({"videos": [{
+        "id": video.id, "title": video.title, "link": video.link, "published": video.published,
+        "published_text": video.published_text, "channel": video.channel_title, "feed_url": video.feed_url,
+        "thumbnail": video.thumbnail,
+    } for video in videos]}, ensure_ascii=False).encode("utf-8")
+
+def videos_to_atom(videos):
+    """The served video list as an Atom feed (bytes), newest first, with thumbnails in media:thumbnail."""
+    ET.register_namespace("", "http://www.w3.org/2005/Atom")
+    ET.register_namespace("media", MEDIA_NS.strip("{}"))
+    atom = "{http://www.w3.org/2005/Atom}"
+    feed = ET.Element(f"{atom}feed")
+    ET.SubElement(feed, f"{atom}title").text = "YouTube RSS Viewer: new videos"
+    ET.SubElement(feed, f"{atom}id").text = "urn:youtube-rss-viewer:merged"
+    newest = max((video.published for video in videos if video.published is not None), default=0)
+    ET.SubElement(feed, f"{atom}updated").text = _atom_time(newest) # From the content, so the ETag only changes with it
+    for video in videos:
+        entry = ET.SubElement(feed, f"{atom}entry")
+        ET.SubElement(entry, f"{atom}id").text = video.id
+        ET.SubElement(entry, f"{atom}title").text = video.title
+        ET.SubElement(entry, f"{atom}link", rel="alternate", href=video.link)
+        ET.SubElement(ET.SubElement(entry, f"{atom}author"), f"{atom}name").text = video.channel_title
+        stamp = _atom_time(video.published if video.published is not None else newest)
+        ET.SubElement(entry, f"{atom}published").text = stamp
+        ET.SubElement(entry, f"{atom}updated").text = stamp
+        if video.thumbnail:
+            ET.SubElement(ET.SubElement(entry, f"{MEDIA_NS}group"), f"{MEDIA_NS}thumbnail", url=video.thumbnail)
+    return ET.tostring(feed, encoding="utf-8", xml_declaration=True)
+
+
+class FeedAggregator:
+    """
+    Headless counterpart of YouTubeRSSViewerApp: one FeedFetcher refreshes every feed in feeds.json
+    each interval, and the merged newest-first list of unviewed videos is rendered once per change
+    as JSON and Atom (plain and gzipped, with ETags), so serving a client costs no fetching at all.
+    """
+    def __init__(self, config, interval=None, max_videos=SERVE_MAX_VIDEOS):
+        self.config = config
+        self.limit = config.get("videos_per_channel", DEFAULT_VIDEOS_PER_CHANNEL)
+        self.interval = interval or config.get("serve_interval", DEFAULT_SERVE_INTERVAL)
+        self.max_videos = max_videos
+        self.fetcher = FeedFetcher(
+            max_workers=config.get("fetch_workers", DEFAULT_FETCH_WORKERS),
+            per_host_connections=config.get("per_host_connections", DEFAULT_PER_HOST_CONNECTIONS),
+            cache=load_feed_cache(),
+            health=FeedHealth(load_feed_health()),
+            feed_timeout=config.get("feed_timeout", FETCH_TIMEOUT),
+        )
+        self.video_store = VideoStore()
+        self.feeds_data = load_feeds()
+        self.viewed = load_viewed()
+        self.feed_posts = {} # url -> posts (newest first) of its last successful fetch
+        self.responses = {} # path -> {"type", "body", "gzip", "etag"}, replaced as a whole on publish
+        self._lock = Lock()
+        self._stopped = Event()
+        self._thread = None
+
+    def start(self):
+        """Publishes the stored videos right away, then refreshes in the background."""
+        feed_urls = {feed_info['url'] for feed_info in self.feeds_data}
+        for video in self.video_store.load_recent(feed_urls, self.limit): # Newest first
+            self.feed_posts.setdefault(video.feed_url, []).append(video)
+        self.publish()
+        self._thread = Thread(target=self._run, name="aggregator", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stopped.set()
+        self.fetcher.save_cache()
+        self.fetcher.close()
+        self.video_store.close()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing feeds: {e}")
+            self._stopped.wait(self.interval)
+
+    def refresh(self):
+        """Fetches every feed once and publishes the result; feeds past the deadline are published as they arrive."""
+        self.feeds_data = load_feeds() # Picks up feeds added in the app meanwhile
+        self.fetcher.prune(feed_info['url'] for feed_info in self.feeds_data) # And forgets removed ones
+        self.viewed = load_viewed() # Same for videos marked as viewed
+        start = time.perf_counter()
+        videos, errors, timed_out = self.fetcher.fetch_all(
+            self.feeds_data, self.limit, on_feed=self._feed_done,
+            deadline=self.config.get("refresh_deadline", DEFAULT_REFRESH_DEADLINE), on_late=self._late_feed_done)
+        self.video_store.upsert(videos)
+        self.publish()
+        print(f"Refreshed {len(self.feeds_data)} feeds in {time.perf_counter() - start:.1f} s "
+              f"({errors} errors, {len(timed_out)} still loading).")
+
+    def _feed_done(self, url, posts, ok):
+        if ok: # Failed feeds keep serving their last videos
+            with self._lock:
+                self.feed_posts[url] = posts
+
+    def _late_feed_done(self, url, posts, ok):
+        if ok:
+            self._feed_done(url, posts, ok)
+            self.video_store.upsert(posts)
+            self.publish()
+
+    def publish(self):
+        """Renders the current unviewed videos into the served responses."""
+        with self._lock:
+            feed_urls = {feed_info['url'] for feed_info in self.feeds_data}
+            # In a fixed order, so equal publish times always merge the same way and unchanged content keeps its ETag
+            video_lists = [self.feed_posts[url] for url in sorted(feed_urls) if url in self.feed_posts]
+            unviewed = (video for video in merge_newest_first(*video_lists)
+                        if _compact_video_id(video.id) not in self.viewed)
+            videos = list(itertools.islice(unviewed, self.max_videos))
+            responses = {
+                "/videos.json": self._response(videos_to_json(videos), "application/json; charset=utf-8"),
+                "/feed.atom": self._response(videos_to_atom(videos), "application/atom+xml; charset=utf-8"),
+            }
+            self.responses = responses
+
+    @staticmethod
+    def _response(body, content_type):
+        return {"type": content_type, "body": body, "gzip": gzip.compress(body),
+                "etag": hashlib.sha1(body).hexdigest()[:20]}
+
+
+class AggregatorRequestHandler(BaseHTTPRequestHandler):
+    """Serves a FeedAggregator's precomputed responses (server.aggregator), honouring If-None-Match."""
+    protocol_version = "HTTP/1.1"
+    PATH_ALIASES = {"/": "/videos.json", "/feed": "/feed.atom", "/feed.xml": "/feed.atom"}
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            body = self.server.aggregator.fetcher.metrics.to_prometheus().encode("utf-8")
+            return self._send(200, {"Content-Type": "text/plain; version=0.0.4"}, body, send_body)
+        response = self.server.aggregator.responses.get(self.PATH_ALIASES.get(path, path))
+        if response is None:
+            return self._send(404, {"Content-Type": "text/plain"}, b"Not Found", send_body)
+        compress = "gzip" in self.headers.get("Accept-Encoding", "")
+        etag = f'"{response["etag"]}{"-gz" if compress else ""}"' # Each encoding is its own representation
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if_none_match = self.headers.get("If-None-Match", "")
+        if if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(",")):
+            return self._send(304, headers, b"", False)
+        headers["Content-Type"] = response["type"]
+        if compress: headers["Content-Encoding"] = "gzip"
+        self._send(200, headers, response["gzip"] if compress else response["body"], send_body)
+
+    def _send(self, status, headers, body, send_body):
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)) if status != 304 else "0")
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+
+
+def serve(host=SERVE_DEFAULT_HOST, port=SERVE_DEFAULT_PORT):
+    """Runs the headless aggregator and its HTTP endpoint until interrupted (Ctrl+C)."""
+    aggregator = FeedAggregator(load_config())
+    httpd = ThreadingHTTPServer((host, port), AggregatorRequestHandler)
+    httpd.daemon_threads = True
+    httpd.aggregator = aggregator
+    aggregator.start()
+    print(f"Serving {len(aggregator.feeds_data)} feeds at http://{host}:{port}/videos.json and /feed.atom "
+          f"(refreshed every {aggregator.interval // 60} min).")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        aggregator.close()
+
+
+# --- Thumbnail Cache ---
+
+class ThumbnailCache:
+    """
+    Loads video thumbnails for the rows near the viewport. Downloading, decoding and resizing
+    run on worker threads; the resized PNGs go to a size-bounded disk cache (least recently used
+    files are deleted first) and decoded PhotoImages are kept in a small in-memory LRU.
+    on_ready(url, data) is called from a worker thread; the UI thread hands it to add().
+    """
+    def __init__(self, size, on_ready, cache_dir=THUMBNAIL_CACHE_DIR, disk_limit_mb=DEFAULT_THUMBNAIL_CACHE_MB,
+                 memory_items=THUMBNAIL_MEMORY_ITEMS, workers=THUMBNAIL_WORKERS):
+        self.size = size # (width, height) in pixels
+        self.on_ready = on_ready
+        self.cache_dir = cache_dir
+        self.disk_limit = disk_limit_mb * 1024 * 1024
+        self.memory_items = memory_items
+        self._images = OrderedDict() # url -> PhotoImage, least recently used first (UI thread only)
+        self._pending = set() # URLs queued or loading (UI thread only)
+        self._failed = set() # Not retried this session
+        self._wanted = frozenset() # URLs of the rows in range; replaced, never mutated, so workers can read it
+        self._disk_lock = Lock()
+        self._disk_bytes = None # Counted on the first write
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+
+    def get(self, url):
+        """Returns the PhotoImage for url if it is in memory, otherwise starts loading it and returns None."""
+        image = self._images.get(url)
+        if image is not None:
+            self._images.move_to_end(url)
+            return image
+        if url not in self._pending and url not in self._failed:
+            self._pending.add(url)
+            self._pool.submit(self._load, url)
+        return None
+
+    def set_wanted(self, urls):
+        """Queued loads for any other URL (rows scrolled away) are skipped."""
+        self._wanted = frozenset(urls)
+
+    def add(self, url, data):
+        """Turns a finished load into a PhotoImage (UI thread). Returns it, or None if there is nothing to show."""
+        self._pending.discard(url)
+        if data is None:
+            return None
+        try:
+            image = tk.PhotoImage(data=data, format="png")
+        except tk.TclError as e:
+            print(f"Error decoding thumbnail {url}: {e}")
+            return None
+        self._images[url] = image
+        while len(self._images) > self.memory_items:
+            self._images.popitem(last=False)
+        return image
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self, url):
+        data = None
+        if url in self._wanted:
+            try:
+                path = self._path(url)
+                png = self._read_disk(path)
+                if png is None:
+                    png = self._download(url)
+                    self._write_disk(path, png)
+                data = base64.b64encode(png) # Tk reads base64 image data
+            except Exception as e:
+                self._failed.add(url)
+                print(f"Error loading thumbnail {url}: {e}")
+        self.on_ready(url, data)
+
+    def _path(self, url):
+        key = f"{url}|{self.size[0]}x{self.size[1]}".encode("utf-8")
+        return os.path.join(self.cache_dir, hashlib.sha1(key).hexdigest() + ".png")
+
+    def _read_disk(self, path):
+        try:
+            with open(path, 'rb') as f:
+                png = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path) # Mark as recently used for trimming
+        return png
+
+    def _download(self, url):
+        """Downloads an image and returns it cropped and scaled to self.size, as PNG bytes."""
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            body = response.read()
+        from PIL import Image, ImageOps
+        with Image.open(io.BytesIO(body)) as image:
+            image.draft("RGB", (self.size[0] * 2, self.size[1] * 2)) # JPEG: decode at a reduced scale
+            # Cropping to the row's 16:9 box also cuts off the letterbox bars of YouTube's 4:3 thumbnails
+            thumbnail = ImageOps.fit(image.convert("RGB"), self.size, Image.LANCZOS)
+        output = io.BytesIO()
+        thumbnail.save(output, format="PNG", optimize=True)
+        return output.getvalue()
+
+    def _write_disk(self, path, png):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(png)
+        os.replace(temp_path, path)
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.is_file())
+            else:
+                self._disk_bytes += len(png)
+            if self._disk_bytes > self.disk_limit:
+                self._trim_disk()
+
+    def _trim_disk(self):
+        """Deletes least recently used files until the cache is down to 80% of its limit. Caller holds _disk_lock."""
+        entries = sorted((entry for entry in os.scandir(self.cache_dir) if entry.is_file()),
+                         key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.disk_limit * 0.8:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
+
+
+# --- Virtualized Video List ---
+
+def fit_text(font, text, width):
+    """Returns text, or its longest start that fits in width pixels followed by "…" (width None: no limit)."""
+    if width is None or font.measure(text) <= width:
+        return text
+    low, high = 0, len(text)
+    while low < high: # Binary search on the number of characters kept
+        middle = (low + high + 1) // 2
+        if font.measure(text[:middle].rstrip() + "…") <= width: low = middle
+        else: high = middle - 1
+    return text[:low].rstrip() + "…"
+
+
+class VideoRow:
+    """A recycled list row: checkbox, title link and channel/date info for one video."""
+    def __init__(self, list_view):
+        self.list_view = list_view
+        self.video = None
+        self.truncated = False # The title didn't fit and ends in "…"; the full one shows on hover
+        self.y = -list_view.row_height # Current canvas position
+        self.var = tk.BooleanVar(value=False)
+        self.frame = ttk.Frame(list_view.canvas, padding=(5, 3), style='Item.TFrame')
+        self.checkbox = ttk.Checkbutton(self.frame, variable=self.var, command=self._on_toggle, style='TCheckbutton')
+        self.checkbox.pack(side=tk.LEFT, padx=(0, 8))
+        self.thumbnail_label = None
+        if list_view.thumbnails is not None:
+            self.thumbnail_label = ttk.Label(self.frame, image=list_view.thumbnail_placeholder, style='Info.TLabel')
+            self.thumbnail_label.pack(side=tk.LEFT, padx=(0, 8))
+        text_frame = ttk.Frame(self.frame); text_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.title_label = ttk.Label(text_frame, style='Link.TLabel', cursor="hand2", justify=tk.LEFT)
+        self.title_label.pack(anchor="w", fill=tk.X, pady=(0, 2))
+        self.title_label.bind("<Button-1>", self._on_open)
+        self.title_label.bind("<Enter>", self._on_enter)
+        self.title_label.bind("<Leave>", lambda e: list_view.hide_tooltip())
+        self.info_label = ttk.Label(text_frame, style='Info.TLabel', justify=tk.LEFT)
+        self.info_label.pack(anchor="w", fill=tk.X)
+        self.window_id = list_view.canvas.create_window(0, -list_view.row_height, window=self.frame, anchor="nw")
+        # Pixels of the row not available to the title: frame padding and border, checkbox, thumbnail
+        self.fixed_width = 2 * 5 + 2 * 1 + self.checkbox.winfo_reqwidth() + 8
+        if self.thumbnail_label is not None:
+            self.fixed_width += self.thumbnail_label.winfo_reqwidth() + 8
+
+    def bind_video(self, video):
+        """Points this row at another video, only touching widgets when the video changed."""
+        if video is not self.video:
+            self.video = video
+            self.fit_title()
+            self.info_label.config(text=f"Channel: {video.channel_title} | Published: {video.published_str}")
+            if self.thumbnail_label is not None:
+                url = video.thumbnail
+                image = self.list_view.thumbnails.get(url) if url else None # Loads in the background if needed
+                self.thumbnail_label.config(image=image or self.list_view.thumbnail_placeholder)
+        self.var.set(self.list_view.is_checked(video.id))
+
+    def fit_title(self):
+        """Shows the title, cut to the row's width with "…" if it is too long for one line."""
+        width = self.list_view.canvas_width - self.fixed_width if self.list_view.canvas_width > 1 else None
+        text = fit_text(self.list_view.title_font, self.video.title, width)
+        self.truncated = text != self.video.title
+        self.title_label.config(text=text)
+
+    def _on_enter(self, event):
+        if self.video is not None and self.truncated:
+            self.list_view.show_tooltip(self.video.title, event.x_root + 12, event.y_root + 16)
+
+    def _on_toggle(self):
+        if self.video is not None:
+            self.list_view.on_toggle(self.video.id, self.var.get())
+
+    def _on_open(self, event=None):
+        if self.video is not None:
+            self.list_view.on_open(self.video.link)
+
+
+class VirtualVideoList:
+    """
+    Scrollable video list that only builds widgets for the rows in the viewport
+    (plus a small overscan) and recycles them while scrolling.
+    """
+    def __init__(self, parent, row_height, on_toggle, on_open, is_checked, overscan=LIST_OVERSCAN_ROWS, thumbnails=None,
+                 on_load_more=None, title_font=None):
+        self.row_height = row_height
+        self.title_font = title_font or tkFont.nametofont("TkDefaultFont") # Measures titles for truncation
+        self.canvas_width = 1 # Last width seen by _on_resize
+        self.tooltip = None # Toplevel with the full title of a truncated row, created on first hover
+        self.on_toggle = on_toggle
+        self.on_open = on_open
+        self.is_checked = is_checked
+        self.overscan = overscan
+        self.thumbnails = thumbnails # ThumbnailCache, or None for a text-only list
+        self.thumbnail_placeholder = tk.PhotoImage(width=thumbnails.size[0], height=thumbnails.size[1]) if thumbnails else None
+        self.videos = []
+        self.rows = [] # Pool of VideoRow objects, grown on demand
+        self.row_by_id = {} # Video ID -> VideoRow currently bound to it
+
+        self.canvas = tk.Canvas(parent, bg=COLOR_DARK_BG, highlightthickness=0, yscrollincrement=row_height)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.canvas.yview, style='Vertical.TScrollbar')
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.message_id = self.canvas.create_text(10, 20, anchor="nw", text="", fill=COLOR_TEXT, width=700)
+        # "Load more" button below the last row, shown while not every video is in the list
+        self.more_count = 0
+        self.more_button = ttk.Button(self.canvas, command=on_load_more, style='TButton')
+        self.more_id = self.canvas.create_window(10, 0, window=self.more_button, anchor="nw", state="hidden")
+
+    def set_videos(self, videos):
+        """Replaces the displayed videos and rebinds the visible rows."""
+        self.videos = videos
+        self.set_message("")
+        self._update_scrollregion()
+        self.layout()
+
+    def clear(self):
+        """Removes every video from the list."""
+        self.set_videos([])
+
+    def update_videos(self, videos):
+        """
+        Patches the list to show videos, keyed by video ID. Videos already displayed keep
+        their row (and dict) untouched, and the scroll position stays on the same video.
+        Returns (added, removed) counts.
+        """
+        old_by_id = {video.id: video for video in self.videos}
+        new_ids = set()
+        merged = []
+        added = 0
+        for video in videos:
+            if video.id in new_ids: continue # Same video listed by two feeds
+            new_ids.add(video.id)
+            old = old_by_id.get(video.id)
+            if old is not None and old.same_display(video):
+                merged.append(old) # Unchanged: keep the bound object so its row is not rebuilt
+            else:
+                merged.append(video)
+                if old is None: added += 1
+        removed = sum(1 for video_id in old_by_id if video_id not in new_ids)
+        if not added and not removed and len(merged) == len(self.videos) and all(a is b for a, b in zip(merged, self.videos)):
+            return 0, 0 # Nothing changed, no Tk work at all
+
+        # Remember which video is at the top of the viewport so it stays there
+        top = self.canvas.canvasy(0)
+        anchor_id, anchor_offset = None, 0
+        if top > 0 and self.videos:
+            top_index = min(int(top // self.row_height), len(self.videos) - 1)
+            anchor_offset = top - top_index * self.row_height
+            # First video at or below the top one that survives the update
+            for video in self.videos[top_index:]:
+                if video.id in new_ids:
+                    anchor_id = video.id; break
+
+        self.videos = merged
+        if merged: self.set_message("")
+        self._update_scrollregion()
+        if anchor_id is not None:
+            new_index = next(i for i, video in enumerate(merged) if video.id == anchor_id)
+            total_height = max(self._content_height(), 1)
+            self.canvas.yview_moveto((new_index * self.row_height + anchor_offset) / total_height)
+        self.layout()
+        return added, removed
+
+    def set_more(self, count, page_size):
+        """Shows the "Load more" button below the list if count further videos are available."""
+        if count:
+            self.more_button.config(text=f"Load {min(count, page_size)} more ({count} not shown)")
+            self.canvas.coords(self.more_id, 10, len(self.videos) * self.row_height)
+        if bool(count) != bool(self.more_count):
+            self.canvas.itemconfigure(self.more_id, state="normal" if count else "hidden")
+        self.more_count = count
+        self._update_scrollregion()
+
+    def set_message(self, text):
+        """Shows a message (e.g. 'No new videos found.') in place of the list."""
+        self.canvas.itemconfigure(self.message_id, text=text)
+
+    def count(self):
+        """Returns the number of videos in the list."""
+        return len(self.videos)
+
+    def refresh_checks(self):
+        """Re-reads the checked state of every visible row."""
+        for row in self.row_by_id.values():
+            row.var.set(self.is_checked(row.video.id))
+
+    def thumbnail_ready(self, url, image):
+        """Shows a thumbnail that finished loading in the rows displaying it."""
+        for row in self.row_by_id.values():
+            if row.thumbnail_label is not None and row.video.thumbnail == url:
+                row.thumbnail_label.config(image=image)
+
+    def scroll(self, delta):
+        """Scrolls by delta rows."""
+        self.canvas.yview_scroll(delta, "units")
+
+    def _content_height(self):
+        return (len(self.videos) + (1 if self.more_count else 0)) * self.row_height
+
+    def _update_scrollregion(self):
+        width = max(self.canvas.winfo_width(), 1)
+        self.canvas.configure(scrollregion=(0, 0, width, self._content_height()))
+
+    def _on_resize(self, event):
+        self.canvas.itemconfigure(self.message_id, width=max(event.width - 20, 100))
+        width_changed = event.width != self.canvas_width
+        self.canvas_width = event.width
+        for row in self.rows:
+            self.canvas.itemconfigure(row.window_id, width=event.width)
+            if width_changed and row.video is not None: row.fit_title()
+        self._update_scrollregion()
+        self.layout()
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.hide_tooltip() # The row under the pointer may now show another video
+        self.layout()
+
+    def show_tooltip(self, text, x, y):
+        """Shows text in a small borderless window at screen position (x, y)."""
+        if self.tooltip is None:
+            self.tooltip = tk.Toplevel(self.canvas)
+            self.tooltip.wm_overrideredirect(True)
+            self.tooltip_label = tk.Label(self.tooltip, bg=COLOR_WIDGET_BG, fg=COLOR_TEXT, relief=tk.SOLID, borderwidth=1,
+                                          padx=4, pady=2, justify=tk.LEFT, wraplength=600)
+            self.tooltip_label.pack()
+        self.tooltip_label.config(text=text)
+        self.tooltip.wm_geometry(f"+{x}+{y}")
+        self.tooltip.deiconify()
+        self.tooltip.lift()
+
+    def hide_tooltip(self):
+        if self.tooltip is not None:
+            self.tooltip.withdraw()
+
+    def _visible_range(self):
+        """Returns the [start, end) video indices that need a row widget."""
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.row_height)
+        start = max(int(top // self.row_height) - self.overscan, 0)
+        end = min(int((top + height) // self.row_height) + 1 + self.overscan, len(self.videos))
+        return start, max(start, end)
+
+    def layout(self):
+        """Binds pooled rows to the videos in (and just around) the viewport."""
+        start, end = self._visible_range()
+        needed = {self.videos[index].id: index for index in range(start, end)}
+        if self.thumbnails is not None:
+            self.thumbnails.set_wanted(self.videos[index].thumbnail for index in range(start, end))
+        # Release rows whose video scrolled out of range, was removed or was replaced
+        free_rows = []
+        for video_id in list(self.row_by_id):
+            index = needed.get(video_id)
+            if index is None or self.row_by_id[video_id].video is not self.videos[index]:
+                free_rows.append(self.row_by_id.pop(video_id))
+        free_rows.extend(row for row in self.rows if row.video is None)
+        width = self.canvas.winfo_width()
+        for video_id, index in needed.items():
+            row = self.row_by_id.get(video_id)
+            if row is None:
+                if free_rows:
+                    row = free_rows.pop()
+                else:
+                    row = VideoRow(self)
+                    self.rows.append(row)
+                    if width > 1: self.canvas.itemconfigure(row.window_id, width=width)
+                    self.canvas.itemconfigure(row.window_id, height=self.row_height - LIST_ROW_GAP)
+                self.row_by_id[video_id] = row
+                row.bind_video(self.videos[index])
+            y = index * self.row_height
+            if row.y != y: # Existing rows only move when videos were inserted/removed above them
+                row.y = y
+                self.canvas.coords(row.window_id, 0, y)
+        # Park unused rows above the scroll region
+        for row in free_rows:
+            row.video = None
+            row.y = -2 * self.row_height
+            self.canvas.coords(row.window_id, 0, row.y)
+
+
+# --- Startup Profiling ---
+
+class StartupTimer:
+    """Named points of the launch, in seconds since the script started, for --profile-startup."""
+    def __init__(self, started=STARTUP_STARTED):
+        self.started = started
+        self.marks = [] # [(name, time.perf_counter())]
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def elapsed_ms(self, name):
+        """Milliseconds from the start to the named mark, or None if it wasn't reached."""
+        for mark_name, at in self.marks:
+            if mark_name == name:
+                return (at - self.started) * 1000
+        return None
+
+    def report(self, target_ms=STARTUP_TARGET_MS):
+        """Prints every step and its duration. Returns True if the first paint came within target_ms."""
+        print("Startup profile (ms since the script started):")
+        previous = self.started
+        for name, at in self.marks:
+            print(f"  {name:<22}{(at - self.started) * 1000:>9.1f}  (+{(at - previous) * 1000:.1f})")
+            previous = at
+        first_paint = self.elapsed_ms("first paint")
+        if first_paint is None:
+            print("The window was never drawn.")
+            return False
+        within = first_paint <= target_ms
+        print(f"First paint after {first_paint:.0f} ms, target {target_ms} ms: {'OK' if within else 'TOO SLOW'}")
+        return within
+
+
+startup_timer = StartupTimer()
+
 
 # --- GUI Application Class ---
 # <<< Keep all imports and helper functions from the previous version here >>>
@@ -137,8 +2412,9 @@ def save_viewed(viewed_dict):
 
 
 class YouTubeRSSViewerApp:
-    def __init__(self, root):
+    def __init__(self, root, profile_startup=False):
         self.root = root
+        self.profile_startup = profile_startup # Stop after showing the stored videos: no refresh, no polling
         self.root.title("YouTube RSS Feed Viewer")
         self.root.geometry("900x700")
         self.root.config(bg=COLOR_DARK_BG)
@@ -149,21 +2425,102 @@ class YouTubeRSSViewerApp:
 
         self.setup_style()
 
-        # --- MODIFIED: Load feed data (list of dicts) ---
-        self.feeds_data = load_feeds() # Renamed from self.feeds
-        self.viewed_videos = load_viewed()
         # --- *** Load Config and Setup Variable *** ---
-        self.config = load_config()
+        self.config = load_config() # Small, and the window needs it
+        startup_timer.mark("config loaded")
+        # --- MODIFIED: feeds, viewed marks and the feed cache are loaded by finish_startup, after the first paint ---
+        self.feeds_data = [] # Renamed from self.feeds
+        self.feed_url_index = set()
+        self.viewed_videos = None # ViewedStore
+        self.fetcher = None # FeedFetcher
         self.videos_per_channel_var = tk.IntVar(value=self.config.get("videos_per_channel", DEFAULT_VIDEOS_PER_CHANNEL))
-
-        self.all_videos = []
-        self.checkbox_vars = {}
+        self.refresh_deadline = self.config.get("refresh_deadline", DEFAULT_REFRESH_DEADLINE)
+        self.video_store = VideoStore()
+        self.poll_limit = self.config.get("videos_per_channel", DEFAULT_VIDEOS_PER_CHANNEL) # Read by the poller thread
+        self.scheduler = PollScheduler(
+            fetch=lambda url: self.fetcher.fetch_single_feed(url, self.poll_limit, skip_open=True),
+            on_result=lambda url, feed_data: self.result_queue.put(("poll", url, feed_data)),
+        )
+        # Worker threads never touch Tk: they put results here and drain_results applies them
+        self.result_queue = queue.Queue()
+        self.refresh_generation = 0 # Results of superseded refreshes are dropped
+        self.refresh_progress = None # {"done", "total", "errors"} while a refresh streams in
+        self.timed_out_feeds = set() # URLs still loading after the last refresh's deadline
+        self.late_results = {} # url -> (posts, ok) of those, waiting to be merged
+        self.thumbnails = None
+        if PIL_AVAILABLE:
+            thumbnail_height = self.get_row_height() - LIST_ROW_GAP - 2 * 3 - 2 * 1 # Same as the text lines
+            self.thumbnails = ThumbnailCache(
+                (thumbnail_height * 16 // 9, thumbnail_height),
+                on_ready=lambda url, data: self.result_queue.put(("thumbnail", url, data)),
+                disk_limit_mb=self.config.get("thumbnail_cache_mb", DEFAULT_THUMBNAIL_CACHE_MB),
+            )
+        else:
+            print("Pillow is not installed, thumbnails are disabled (pip install Pillow).")
+
+        self.all_videos = [] # Videos of the selected group's feeds
+        self.unviewed_videos = [] # all_videos minus viewed, before the search filter
+        self.current_group = self.config.get("group", FILTER_ALL_GROUPS)
+        self.view_feed_urls = set() # Feeds whose videos are in all_videos
+        self.feed_videos = {} # url -> videos (newest first) as last shown, so switching groups is instant
+        self.fetched_feeds = set() # Feeds fetched this session; a group's other feeds are fetched when it is shown
+        self.page_size = self.config.get("page_size", DEFAULT_PAGE_SIZE)
+        self.display_limit = self.page_size # Grows by page_size with every "Load more"
+        self.video_index = VideoIndex()
+        self.checked_ids = set() # IDs ticked in the current list (rows are recycled, so state lives here)
         self.feeds_list_window = None
+        self.import_progress = None # Set while feeds are being added/imported in the background
         self.feed_listbox_widget = None # Added missing init here
+        self.diagnostics_window = None
 
         self.setup_ui()
-        # Refresh feeds using the new self.feeds_data
-        self.refresh_feeds()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.drain_after_id = self.root.after(RESULT_DRAIN_INTERVAL_MS, self.drain_results)
+        startup_timer.mark("window built")
+        self.startup_done = False
+        self.expose_binding = self.root.bind("<Expose>", self.on_first_expose, add="+")
+        self.startup_fallback_id = self.root.after(STARTUP_FALLBACK_MS, self.finish_startup)
+
+    # --- *** NEW METHOD: on_first_expose *** ---
+    def on_first_expose(self, event=None):
+        """The window is on screen: load the data once Tk has redrawn it."""
+        self.root.unbind("<Expose>", self.expose_binding)
+        self.root.after_idle(lambda: self.finish_startup(exposed=True)) # After the redraws the Expose scheduled
+
+    # --- *** NEW METHOD: finish_startup *** ---
+    def finish_startup(self, exposed=False):
+        """Loads the data files once the window is on screen, shows the stored videos, then starts refreshing."""
+        if self.startup_done:
+            return
+        self.startup_done = True
+        self.root.after_cancel(self.startup_fallback_id)
+        self.root.update_idletasks() # Draw everything still pending before blocking on file loads
+        if exposed: # Not after the fallback timeout: then the window was never shown
+            startup_timer.mark("first paint")
+        self.feeds_data = load_feeds()
+        self.feed_url_index = {feed_url_key(feed_info['url']) for feed_info in self.feeds_data}
+        self.viewed_videos = ViewedStore(retention_days=self.config.get("viewed_retention_days", DEFAULT_VIEWED_RETENTION_DAYS))
+        self.fetcher = FeedFetcher(
+            max_workers=self.config.get("fetch_workers", DEFAULT_FETCH_WORKERS),
+            per_host_connections=self.config.get("per_host_connections", DEFAULT_PER_HOST_CONNECTIONS),
+            cache=load_feed_cache(),
+            health=FeedHealth(load_feed_health()),
+            feed_timeout=self.config.get("feed_timeout", FETCH_TIMEOUT),
+        )
+        self.fetcher.prune(feed_info['url'] for feed_info in self.feeds_data) # Feeds removed by hand, rejected imports
+        startup_timer.mark("data loaded")
+        for control in self.startup_controls:
+            control.state(["!disabled"])
+        # setup_ui filled the group box before the feeds were loaded, which dropped the saved group
+        self.current_group = self.config.get("group", FILTER_ALL_GROUPS)
+        self.update_group_choices()
+        # Shows the group's last known videos right away, then revalidates them over the network
+        self.show_group(fetch=not self.profile_startup)
+        startup_timer.mark("stored videos shown")
+        if self.profile_startup:
+            self.on_close()
+            return
+        self.scheduler.start()
 
     # --- setup_style method (Unchanged) ---
     def setup_style(self):
@@ -187,6 +2544,16 @@ class YouTubeRSSViewerApp:
         style.configure('Link.TLabel', foreground=COLOR_LINK, background=COLOR_DARK_BG, font=self.font_title)
         style.configure('Info.TLabel', foreground=COLOR_TEXT_DIM, background=COLOR_DARK_BG, font=self.font_info)
         style.configure('Item.TFrame', background=COLOR_DARK_BG, bordercolor=COLOR_BORDER, relief=tk.GROOVE, borderwidth=1)
+        # The Treeview style is only needed by the diagnostics window: setup_treeview_style runs when it opens
+
+    # --- *** NEW METHOD: setup_treeview_style *** ---
+    def setup_treeview_style(self):
+        """Configures the Treeview style for the diagnostics table."""
+        style = ttk.Style(self.root)
+        style.configure('Treeview', background=COLOR_WIDGET_BG, fieldbackground=COLOR_WIDGET_BG, foreground=COLOR_TEXT, bordercolor=COLOR_BORDER)
+        style.map('Treeview', background=[('selected', COLOR_SELECT_BG)], foreground=[('selected', COLOR_SELECT_FG)])
+        style.configure('Treeview.Heading', background=COLOR_DARK_BG, foreground=COLOR_TEXT, bordercolor=COLOR_BORDER)
+        style.map('Treeview.Heading', background=[('active', COLOR_SELECT_BG)])
 
 
     # --- setup_ui method (MODIFIED - added Spinbox) ---
@@ -200,24 +2567,57 @@ class YouTubeRSSViewerApp:
         # Store ref to button if needed later (e.g. for disabling during add)
         self.add_button_widget = ttk.Button(top_frame, text="Add Feed", command=self.add_feed, style='TButton')
         self.add_button_widget.pack(side=tk.LEFT, padx=(5, 0))
-
-
-        # --- Middle Frame: Video List (Scrollable) (Unchanged) ---
+        self.feed_url_entry.bind("<Return>", lambda e: self.add_feed())
+        self.import_button = ttk.Button(top_frame, text="Import...", command=self.import_feeds, style='TButton')
+        self.import_button.pack(side=tk.LEFT, padx=(5, 0))
+        export_button = ttk.Button(top_frame, text="Export...", command=self.export_feeds, style='TButton')
+        export_button.pack(side=tk.LEFT, padx=(5, 0))
+
+
+        # --- Filter Frame: Search & Facets ---
+        filter_frame = ttk.Frame(self.root, padding=(5, 0))
+        filter_frame.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(filter_frame, text="Group:").pack(side=tk.LEFT, padx=(0, 5))
+        self.group_var = tk.StringVar()
+        self.group_box = ttk.Combobox(filter_frame, textvariable=self.group_var, state="readonly", width=16)
+        self.group_box.pack(side=tk.LEFT, padx=(0, 10))
+        self.group_box.bind("<<ComboboxSelected>>", lambda e: self.on_group_changed())
+        self.update_group_choices()
+        ttk.Label(filter_frame, text="Search:").pack(side=tk.LEFT, padx=(0, 5))
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(filter_frame, textvariable=self.search_var, width=40)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        search_entry.bind("<Escape>", lambda e: self.clear_filter())
+        self.channel_filter_var = tk.StringVar(value=FILTER_ALL_CHANNELS)
+        self.channel_filter_box = ttk.Combobox(filter_frame, textvariable=self.channel_filter_var, values=[FILTER_ALL_CHANNELS],
+                                               state="readonly", width=25)
+        self.channel_filter_box.pack(side=tk.LEFT, padx=(5, 0))
+        self.date_filter_var = tk.StringVar(value="Any time")
+        date_filter_box = ttk.Combobox(filter_frame, textvariable=self.date_filter_var, values=list(FILTER_DATE_RANGES),
+                                       state="readonly", width=14)
+        date_filter_box.pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(filter_frame, text="Clear", command=self.clear_filter, style='TButton').pack(side=tk.LEFT, padx=(5, 0))
+        for var in (self.search_var, self.channel_filter_var, self.date_filter_var):
+            var.trace_add("write", lambda *args: self.on_filter_changed())
+
+        # --- Middle Frame: Video List (Virtualized) (MODIFIED) ---
         list_container = ttk.Frame(self.root, padding="5")
         list_container.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-        canvas = tk.Canvas(list_container, bg=COLOR_DARK_BG, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(list_container, orient="vertical", command=canvas.yview, style='Vertical.TScrollbar')
-        self.scrollable_frame = ttk.Frame(canvas, style='TFrame')
-        self.scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        self.video_list = VirtualVideoList(
+            list_container,
+            row_height=self.get_row_height(),
+            on_toggle=self.toggle_viewed,
+            on_open=self.open_link,
+            is_checked=lambda video_id: video_id in self.checked_ids,
+            thumbnails=self.thumbnails,
+            title_font=self.font_title,
+            on_load_more=self.load_more,
+        )
         def _on_mousewheel(event):
             if event.num == 4: delta = -1
             elif event.num == 5: delta = 1
             else: delta = -1 * int(event.delta / 120)
-            if canvas.winfo_exists(): canvas.yview_scroll(delta, "units")
+            if self.video_list.canvas.winfo_exists(): self.video_list.scroll(delta)
         self.root.bind_all("<MouseWheel>", _on_mousewheel)
         self.root.bind_all("<Button-4>", _on_mousewheel)
         self.root.bind_all("<Button-5>", _on_mousewheel)
@@ -231,7 +2631,13 @@ class YouTubeRSSViewerApp:
         refresh_button.pack(side=tk.LEFT, padx=(0, 5))
 
         view_feeds_button = ttk.Button(bottom_frame, text="View Feeds", command=self.show_feeds_list, style='TButton')
-        view_feeds_button.pack(side=tk.LEFT, padx=(0, 15)) # Added more padding
+        view_feeds_button.pack(side=tk.LEFT, padx=(0, 5))
+
+        mark_shown_button = ttk.Button(bottom_frame, text="Mark Shown Viewed", command=self.mark_shown_viewed, style='TButton')
+        mark_shown_button.pack(side=tk.LEFT, padx=(0, 5))
+
+        diagnostics_button = ttk.Button(bottom_frame, text="Diagnostics", command=self.show_diagnostics, style='TButton')
+        diagnostics_button.pack(side=tk.LEFT, padx=(0, 15)) # Added more padding
 
         # *** ADDED Videos per Channel Limit Controls ***
         limit_label = ttk.Label(bottom_frame, text="Videos per Channel:")
@@ -251,9 +2657,20 @@ class YouTubeRSSViewerApp:
         limit_spinbox.pack(side=tk.LEFT)
         # ---
 
-        self.status_label = ttk.Label(bottom_frame, text="Status: Idle")
+        self.status_label = ttk.Label(bottom_frame, text="Status: Loading...")
         self.status_label.pack(side=tk.RIGHT) # Status label pushed to the right
 
+        # Controls that need the feeds, the viewed marks or the fetcher: finish_startup enables them
+        self.startup_controls = [self.feed_url_entry, self.add_button_widget, self.import_button, export_button, self.group_box,
+                                 refresh_button, view_feeds_button, mark_shown_button, diagnostics_button]
+        for control in self.startup_controls:
+            control.state(["disabled"])
+
+    def get_row_height(self):
+        """Returns the fixed pixel height of one video row (title + info line, padding and gap)."""
+        text_height = self.font_title.metrics("linespace") + 2 + self.font_info.metrics("linespace")
+        return text_height + 2 * 3 + 2 * 1 + LIST_ROW_GAP # Frame padding, border, gap
+
 
     # --- *** NEW Method: save_current_config *** ---
     def save_current_config(self):
@@ -261,7 +2678,8 @@ class YouTubeRSSViewerApp:
         try:
             # Update the config dictionary from the UI variable
             self.config["videos_per_channel"] = self.videos_per_channel_var.get()
-            # Add other settings here if needed in the future
+            self.poll_limit = self.config["videos_per_channel"]
+            # Worker settings are kept as loaded (edited in config.json)
             save_config(self.config)
             # print(f"Config saved: Videos per channel = {self.config['videos_per_channel']}") # Optional debug print
         except tk.TclError:
@@ -269,221 +2687,494 @@ class YouTubeRSSViewerApp:
         except Exception as e:
              print(f"Error saving config: {e}")
 
-    # --- fetch_single_feed (MODIFIED - Now a method, applies limit) ---
-    def fetch_single_feed(self, rss_url):
+    # --- fetch_single_feed (MODIFIED - delegates to the FeedFetcher engine) ---
+    def fetch_single_feed(self, rss_url, limit=None):
         """
         Fetches and parses a single RSS feed, limiting entries.
         Returns a dictionary with feed details and entries, or None on error.
         """
-        print(f"Fetching: {rss_url}")
-        try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 ...'} # Keep User-Agent
-            feed = feedparser.parse(rss_url, agent=headers['User-Agent'])
-
-            # --- Get the limit from the instance variable ---
-            try:
-                 limit = self.videos_per_channel_var.get()
-            except tk.TclError: # Handle case where variable might not be fully ready
-                 limit = DEFAULT_VIDEOS_PER_CHANNEL
-                 print(f"Warning: Using default limit ({limit}) as UI variable wasn't ready.")
-            # ---
-
-            if feed.bozo:
-                 bozo_msg = feed.get('bozo_exception', 'Unknown issue')
-                 print(f"Warning: Feedparser issues with {rss_url}. Bozo: {bozo_msg}")
-
-            http_status = feed.get("status")
-            if http_status and http_status != 200:
-                print(f"HTTP Error {http_status} for feed: {rss_url}")
-                return {"Feed Title": f"HTTP Error {http_status}", "posts": [], "Feed Link": rss_url, "status": "error"}
-            elif not feed.entries and not feed.feed:
-                 print(f"Error: Feed seems empty or parsing failed for {rss_url}.")
-                 return {"Feed Title": f"Empty/Failed Parse {rss_url}", "posts": [], "Feed Link": rss_url, "status": "error"}
-
-            feed_title = feed.feed.get("title", "Unknown Channel")
-            feed_link = feed.feed.get("link", rss_url)
-            posts_details = {"Feed Title": feed_title, "Feed Link": feed_link, "status": "ok"}
-            processed_entries = []
-
-            # --- Apply the limit by slicing the entries ---
-            entries_to_process = feed.entries[:limit]
-            # ---
-
-            # print(f"Processing {len(entries_to_process)} entries (limit: {limit}) for {feed_title}") # Debugging
-
-            for entry in entries_to_process: # Iterate through the limited list
-                published_dt = None; published_str = "Unknown date"
-                published_parsed = entry.get('published_parsed')
-                if published_parsed:
-                    try:
-                        published_dt = datetime.fromtimestamp(time.mktime(published_parsed))
-                        published_str = published_dt.strftime('%Y-%m-%d %H:%M:%S')
-                    except Exception as date_e: print(f"Date error: {date_e}")
-                elif 'published' in entry: published_str = entry.published
-
-                video_id = entry.get("id", entry.get("link"))
-                if not video_id: continue # Skip if no ID
-
-                processed_entries.append({
-                    "title": entry.get("title", "No Title"), "link": entry.get("link", "#"),
-                    "id": video_id, "published_str": published_str, "published_dt": published_dt,
-                    "channel_title": feed_title # This will be overwritten later by stored name
-                })
-
-            posts_details["posts"] = processed_entries
-            return posts_details
+        if limit is None:
+            limit = self.get_videos_per_channel()
+        return self.fetcher.fetch_single_feed(rss_url, limit)
 
-        except Exception as e:
-            import traceback
-            print(f"Critical Error fetching/parsing feed {rss_url}: {e}")
-            traceback.print_exc()
-            return {"Feed Title": f"Error Parsing {rss_url}", "posts": [], "Feed Link": rss_url, "status": "error"}
+    def get_videos_per_channel(self):
+        """Returns the current per-channel limit, falling back to the default."""
+        try:
+            return self.videos_per_channel_var.get()
+        except tk.TclError: # Handle case where variable might not be fully ready
+            print(f"Warning: Using default limit ({DEFAULT_VIDEOS_PER_CHANNEL}) as UI variable wasn't ready.")
+            return DEFAULT_VIDEOS_PER_CHANNEL
 
 
 
 
-    # --- add_feed method (MODIFIED - calls self.fetch_single_feed) ---
+    # --- add_feed method (MODIFIED - validates in the background) ---
     def add_feed(self):
-        # ... (URL validation - unchanged) ...
         new_url = self.feed_url_entry.get().strip()
-        # ... (validation checks ...)
-        if any(feed_info['url'] == new_url for feed_info in self.feeds_data):
+        if not new_url:
+            return
+        if feed_url_key(new_url) in self.feed_url_index:
              messagebox.showinfo("Duplicate Feed", "This feed URL is already in the list.")
              return
+        self.start_feed_import([(new_url, None)], single=True)
+
+    # --- *** NEW Method: import_feeds *** ---
+    def import_feeds(self):
+        """Imports subscriptions from an OPML file or a plain list of feed URLs."""
+        path = filedialog.askopenfilename(parent=self.root, title="Import Feeds",
+                                          filetypes=[("OPML or URL list", "*.opml *.xml *.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            with open(path, 'rb') as f:
+                subscriptions = parse_subscriptions(f.read())
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import Failed", f"Could not read {path}:\n{e}")
+            return
+        new_subscriptions, groups, seen = [], {}, set(self.feed_url_index)
+        for url, name, group in subscriptions:
+            key = feed_url_key(url)
+            if key not in seen:
+                seen.add(key)
+                new_subscriptions.append((url, name))
+                if group: groups[url] = group
+        if not new_subscriptions:
+            messagebox.showinfo("Import Feeds", f"No new feeds found in the file ({len(subscriptions)} already in the list).")
+            return
+        self.start_feed_import(new_subscriptions, groups=groups)
 
-        self.status_label.config(text=f"Status: Fetching title for {new_url}...")
-        self.root.update_idletasks()
-
-        # --- MODIFIED Call ---
-        feed_details = self.fetch_single_feed(new_url) # Call the METHOD now
-
-        self.status_label.config(text="Status: Idle")
-
-        if feed_details and feed_details.get("status") == "ok":
-            channel_name = feed_details.get("Feed Title", f"Unknown ({new_url})")
-            new_feed_info = {"url": new_url, "name": channel_name}
-            self.feeds_data.append(new_feed_info)
+    # --- *** NEW Method: start_feed_import *** ---
+    def start_feed_import(self, subscriptions, single=False, groups=None):
+        """
+        Validates subscriptions on a worker thread; drain_results collects the outcome.
+        Feeds go into groups[url], or the selected group if there is none.
+        """
+        if self.import_progress is not None:
+            messagebox.showinfo("Busy", "Feeds are still being added. Please wait until that finishes.")
+            return
+        self.import_progress = {"done": 0, "total": len(subscriptions), "added": [], "failed": [], "single": single,
+                                "groups": groups or {}}
+        self.add_button_widget.config(state=tk.DISABLED)
+        self.import_button.config(state=tk.DISABLED)
+        if single: self.status_label.config(text=f"Status: Fetching title for {subscriptions[0][0]}...")
+        else: self.status_label.config(text=f"Status: Importing {len(subscriptions)} feeds...")
+        thread = Thread(target=self.import_feeds_thread, args=(subscriptions, self.get_videos_per_channel()), daemon=True); thread.start()
+
+    def import_feeds_thread(self, subscriptions, limit):
+        on_result = lambda url, feed_info, error: self.result_queue.put(("import", url, feed_info, error))
+        try:
+            self.fetcher.resolve_feeds(subscriptions, limit, on_result=on_result)
+        finally:
+            self.result_queue.put(("import_done",))
+
+    # --- *** NEW Method: finish_feed_import *** ---
+    def finish_feed_import(self):
+        """Adds the validated feeds with a single save, then reports and refreshes."""
+        progress, self.import_progress = self.import_progress, None
+        self.add_button_widget.config(state=tk.NORMAL)
+        self.import_button.config(state=tk.NORMAL)
+        added = []
+        default_group = self.current_group if self.current_group not in (FILTER_ALL_GROUPS, FILTER_UNGROUPED) else None
+        for feed_info in progress["added"]:
+            key = feed_url_key(feed_info['url'])
+            if key not in self.feed_url_index:
+                group = progress["groups"].get(feed_info['url'], default_group)
+                if group: feed_info['group'] = group
+                self.feed_url_index.add(key)
+                self.feeds_data.append(feed_info)
+                added.append(feed_info)
+                print(f"Added feed: {feed_info['name']} - {feed_info['url']}")
+        if added:
             save_feeds(self.feeds_data)
-            self.feed_url_entry.delete(0, tk.END)
-            print(f"Added feed: {channel_name} - {new_url}")
-            self.refresh_feeds()
-        else:
-            err_msg = feed_details.get("Feed Title", "Unknown Error") if feed_details else "Unknown Error"
-            messagebox.showerror("Feed Error", f"Could not fetch feed details for:\n{new_url}\n\nError: {err_msg}\n\nPlease check the URL.")
-            self.status_label.config(text="Status: Feed add failed")
-
 
-    # --- fetch_all_videos_thread (MODIFIED - calls self.fetch_single_feed) ---
-    def fetch_all_videos_thread(self):
-        self.status_label.config(text="Status: Fetching feeds...")
-        self.root.update_idletasks()
-        local_feeds_data = list(self.feeds_data)
-        feed_urls_to_fetch = [fi['url'] for fi in local_feeds_data if 'url' in fi]
-        all_videos_fetched = []
-        errors = 0
-
-        for url in feed_urls_to_fetch:
-            # --- MODIFIED Call ---
-            feed_data = self.fetch_single_feed(url) # Call the METHOD now
-
-            original_name = "Unknown Channel"
-            for item in local_feeds_data: # Find original stored name
-                 if item.get('url') == url: original_name = item.get('name', original_name); break
-
-            if feed_data and feed_data.get("status") == "ok":
-                valid_entries = []
-                for post in feed_data.get("posts", []):
-                    if post.get("id"):
-                         post['channel_title'] = original_name # Use stored name
-                         valid_entries.append(post)
-                all_videos_fetched.extend(valid_entries)
-            # ... (error handling unchanged) ...
-            elif feed_data and feed_data.get("status") == "error":
-                 errors += 1; print(f"Failed to process feed: {url} - {feed_data.get('Feed Title')}")
+        failed = progress["failed"]
+        if progress["single"]:
+            if failed:
+                url, err_msg = failed[0]
+                messagebox.showerror("Feed Error", f"Could not fetch feed details for:\n{url}\n\nError: {err_msg}\n\nPlease check the URL.")
+                self.status_label.config(text="Status: Feed add failed")
             else:
-                 errors += 1; print(f"Failed to process feed (unknown error): {url}")
-
-        # ... (sorting and calling update_video_list unchanged) ...
-        try: all_videos_fetched.sort(key=lambda x: x.get('published_dt', datetime.min), reverse=True)
-        except TypeError as e: print(f"Sorting error: {e}")
-        self.root.after(0, self.update_video_list, all_videos_fetched, errors)
-
-
+                self.feed_url_entry.delete(0, tk.END)
+        else:
+            summary = f"Imported {len(added)} of {progress['total']} feeds."
+            if failed:
+                summary += f"\n\n{len(failed)} could not be fetched:\n" + "\n".join(f"{url} ({error})" for url, error in failed[:10])
+                if len(failed) > 10: summary += f"\n... and {len(failed) - 10} more (see console)."
+                for url, error in failed: print(f"Import failed: {url} - {error}")
+            messagebox.showinfo("Import Feeds", summary)
+            self.status_label.config(text=f"Status: Imported {len(added)} feeds ({len(failed)} failed).")
+        if added:
+            self.update_group_choices()
+            self.show_group() # Fetches the new feeds if they are in the selected group
+
+    # --- *** NEW Method: export_feeds *** ---
+    def export_feeds(self):
+        """Saves the feed list as an OPML file."""
+        if not self.feeds_data:
+            messagebox.showinfo("Export Feeds", "There are no feeds to export.")
+            return
+        path = filedialog.asksaveasfilename(parent=self.root, title="Export Feeds", defaultextension=".opml",
+                                            initialfile="subscriptions.opml", filetypes=[("OPML", "*.opml")])
+        if not path:
+            return
+        try:
+            with open(path, 'wb') as f:
+                f.write(feeds_to_opml(self.feeds_data))
+        except Exception as e:
+            messagebox.showerror("Export Failed", f"Could not write {path}:\n{e}")
+            return
+        self.status_label.config(text=f"Status: Exported {len(self.feeds_data)} feeds.")
+
+
+    # --- fetch_all_videos_thread (MODIFIED - streams each finished feed to the UI queue) ---
+    def fetch_all_videos_thread(self, limit, local_feeds_data, generation):
+        failed = set() # Feeds without new posts (errors, paused); they keep showing what they had
+        def on_feed(url, posts, ok):
+            if not ok: failed.add(url)
+            self.result_queue.put(("feed", generation, url, posts, ok))
+        on_late = lambda url, posts, ok: self.result_queue.put(("late", generation, url, posts, ok))
+        all_videos_fetched, errors, timed_out = self.fetcher.fetch_all(
+            local_feeds_data, limit, on_feed=on_feed, deadline=self.refresh_deadline, on_late=on_late)
+        self.video_store.upsert(all_videos_fetched)
+        refreshed = {feed_info['url'] for feed_info in local_feeds_data}
+        self.result_queue.put(("done", generation, all_videos_fetched, errors, timed_out, refreshed, failed))
+
+    # --- *** NEW Method: drain_results *** ---
+    def drain_results(self):
+        """Runs on the Tk main loop every RESULT_DRAIN_INTERVAL_MS and applies the queued worker results."""
+        try:
+            self.apply_results()
+        finally: # One bad result must not stop every later one from being applied
+            self.drain_after_id = self.root.after(RESULT_DRAIN_INTERVAL_MS, self.drain_results)
+
+    def apply_results(self):
+        """Applies everything the worker threads queued since the last run, coalescing finished feeds into one list update."""
+        streamed = {} # url -> posts of feeds finished since the last drain
+        polled = {}
+        final = None
+        import_done = False
+        while True:
+            try:
+                item = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+            kind = item[0]
+            if kind == "feed":
+                _, generation, url, posts, ok = item
+                if generation != self.refresh_generation or self.refresh_progress is None: continue
+                self.refresh_progress["done"] += 1
+                if ok: streamed[url] = posts
+                else: self.refresh_progress["errors"] += 1
+            elif kind == "done":
+                _, generation, videos, errors, timed_out, refreshed, failed = item
+                if generation == self.refresh_generation: final = (videos, errors, timed_out, refreshed, failed)
+            elif kind == "late":
+                _, generation, url, posts, ok = item
+                if generation == self.refresh_generation: self.late_results[url] = (posts, ok)
+            elif kind == "poll":
+                _, url, feed_data = item
+                polled[url] = feed_data
+            elif kind == "import":
+                _, url, feed_info, error = item
+                self.import_progress["done"] += 1
+                if feed_info: self.import_progress["added"].append(feed_info)
+                else: self.import_progress["failed"].append((url, error))
+            elif kind == "import_done":
+                import_done = True
+            elif kind == "thumbnail":
+                _, url, data = item
+                image = self.thumbnails.add(url, data)
+                if image is not None: self.video_list.thumbnail_ready(url, image)
+
+        if final is not None:
+            videos, errors, timed_out, refreshed, failed = final
+            self.refresh_progress = None
+            self.fetched_feeds.update(refreshed)
+            self.timed_out_feeds = set(timed_out) - set(self.late_results)
+            # Feeds the refresh didn't cover, that failed, or that are still loading keep showing what they had
+            stale = failed.union(timed_out)
+            kept = [video for video in self.all_videos if video.feed_url not in refreshed or video.feed_url in stale]
+            if kept: videos = list(merge_newest_first(videos, kept))
+            if not self.view_feed_urls.issuperset(refreshed): # Feeds deleted while the refresh ran
+                videos = [video for video in videos if video.feed_url in self.view_feed_urls]
+            self.update_video_list(videos, errors)
+        elif streamed:
+            self.merge_feed_posts({url: posts for url, posts in streamed.items() if url in self.view_feed_urls})
+            progress = self.refresh_progress
+            status_text = f"Status: Fetching feeds... {progress['done']}/{progress['total']} done, {self.video_list.count()} new videos."
+            if progress["errors"]: status_text += f" ({progress['errors']} feed errors)"
+            self.status_label.config(text=status_text)
+        if self.late_results and self.refresh_progress is None: # Held back until the refresh they belong to is shown
+            self.merge_late_feeds()
+        for url, feed_data in polled.items():
+            self.merge_polled_feed(url, feed_data)
+        if import_done:
+            self.finish_feed_import()
+        elif self.import_progress and not self.import_progress["single"] and self.import_progress["done"]:
+            progress = self.import_progress
+            self.status_label.config(text=f"Status: Importing feeds... {progress['done']}/{progress['total']} checked, {len(progress['failed'])} failed.")
+
+    # --- *** NEW Method: merge_feed_posts *** ---
+    def merge_feed_posts(self, posts_by_feed, final=False):
+        """
+        Replaces the videos of the feeds in posts_by_feed ({url: posts}) and merges the new
+        posts into their sorted position, then updates the list.
+        """
+        incoming = [sorted(posts, key=video_sort_key, reverse=True) for posts in posts_by_feed.values()]
+        kept = [video for video in self.all_videos if video.feed_url not in posts_by_feed]
+        # A list, not the lazy merge: the search index, the unviewed list and the "N more" count read every
+        # video on each update anyway. The merge is linear (no re-sort), and drain_results coalesces
+        # streamed feeds, so this runs at most once per RESULT_DRAIN_INTERVAL_MS. Only the page is rendered.
+        self.update_video_list(list(merge_newest_first(kept, *incoming)), 0, final=final)
+
+
+
+    # --- *** NEW Method: merge_late_feeds *** ---
+    def merge_late_feeds(self):
+        """Merges feeds that finished after the refresh deadline into the displayed videos."""
+        late, self.late_results = self.late_results, {}
+        self.timed_out_feeds.difference_update(late)
+        fetched = {url: posts for url, (posts, ok) in late.items() if ok and url in self.view_feed_urls} # Failed ones keep their videos
+        for posts in fetched.values():
+            self.video_store.upsert(posts)
+        self.merge_feed_posts(fetched, final=True) # The refresh is over: update the status and the poller too
+
+    def timed_out_status(self):
+        """Status bar note naming the feeds still loading after the refresh deadline."""
+        feed_names = {feed_info['url']: feed_info.get('name', feed_info['url']) for feed_info in self.feeds_data}
+        names = sorted(feed_names.get(url, url) for url in self.timed_out_feeds)
+        shown = ", ".join(names[:3]) + (f" and {len(names) - 3} more" if len(names) > 3 else "")
+        return f" (Timed out, still loading: {shown})"
+
+    # --- *** NEW Methods: feed groups *** ---
+    def group_names(self):
+        return sorted({feed_info['group'] for feed_info in self.feeds_data if feed_info.get('group')}, key=str.lower)
+
+    def update_group_choices(self):
+        """Fills the group selector, falling back to all groups if the selected one is gone."""
+        names = self.group_names()
+        choices = [FILTER_ALL_GROUPS] + names
+        if names and any(not feed_info.get('group') for feed_info in self.feeds_data):
+            choices.append(FILTER_UNGROUPED)
+        if self.current_group not in choices:
+            self.current_group = FILTER_ALL_GROUPS
+        self.group_box.config(values=choices)
+        self.group_var.set(self.current_group)
+
+    def group_feeds(self):
+        """The feeds_data entries of the selected group."""
+        if self.current_group == FILTER_ALL_GROUPS:
+            return list(self.feeds_data)
+        if self.current_group == FILTER_UNGROUPED:
+            return [feed_info for feed_info in self.feeds_data if not feed_info.get('group')]
+        return [feed_info for feed_info in self.feeds_data if feed_info.get('group') == self.current_group]
+
+    def on_group_changed(self):
+        if self.group_var.get() == self.current_group:
+            return
+        self.current_group = self.group_var.get()
+        self.config["group"] = self.current_group
+        save_config(self.config)
+        self.show_group()
 
-    # --- refresh_feeds method (Unchanged) ---
-    def refresh_feeds(self):
-        for widget in self.scrollable_frame.winfo_children(): widget.destroy()
-        self.checkbox_vars.clear()
-        thread = Thread(target=self.fetch_all_videos_thread, daemon=True); thread.start()
+    def show_group(self, fetch=True):
+        """
+        Shows the selected group's videos as last seen (or from the video database), without
+        touching the network; then (if fetch) fetches only the group's feeds not fetched yet this session.
+        """
+        # Remember what the current view shows, per feed
+        shown = {url: [] for url in self.view_feed_urls}
+        for video in self.all_videos:
+            if video.feed_url in shown: shown[video.feed_url].append(video)
+        self.feed_videos.update(shown)
+
+        self.refresh_generation += 1 # Results still streaming in for the previous view are dropped
+        self.refresh_progress = None
+        self.timed_out_feeds = set(); self.late_results = {}
+        feeds = self.group_feeds()
+        self.view_feed_urls = {feed_info['url'] for feed_info in feeds}
+        missing = self.view_feed_urls - self.feed_videos.keys()
+        if missing:
+            for url in missing: self.feed_videos[url] = []
+            for video in self.video_store.load_recent(missing, self.get_videos_per_channel()): # Newest first
+                self.feed_videos[video.feed_url].append(video)
+        videos = list(merge_newest_first(*(self.feed_videos[url] for url in self.view_feed_urls)))
+
+        unfetched = [feed_info for feed_info in feeds if fetch and feed_info['url'] not in self.fetched_feeds]
+        self.display_limit = self.page_size
+        self.update_video_list(videos, 0, final=not unfetched)
+        if unfetched:
+            self.refresh_feeds(unfetched)
+
+    # --- refresh_feeds method (MODIFIED - only the selected group's feeds) ---
+    def refresh_feeds(self, feeds=None):
+        """Fetches the selected group's feeds, or just feeds (some of them)."""
+        # The current list stays visible while fetching; update_video_list patches it afterwards
+        limit = self.get_videos_per_channel() # Read Tk variable on the main thread
+        self.poll_limit = limit
+        local_feeds_data = list(feeds if feeds is not None else self.group_feeds())
+        self.refresh_generation += 1
+        self.timed_out_feeds = set(); self.late_results = {} # Stragglers of the previous refresh are dropped
+        self.refresh_progress = {"done": 0, "total": len({feed_info['url'] for feed_info in local_feeds_data}), "errors": 0}
+        self.status_label.config(text="Status: Fetching feeds...")
+        thread = Thread(target=self.fetch_all_videos_thread, args=(limit, local_feeds_data, self.refresh_generation), daemon=True); thread.start()
 
-    # --- update_video_list method (Unchanged from previous version) ---
-    def update_video_list(self, fetched_videos, error_count):
+    # --- update_video_list method (MODIFIED - hands the videos to the virtualized list) ---
+    def update_video_list(self, fetched_videos, error_count, final=True):
+        """
+        Shows fetched_videos minus the viewed ones. final=False marks a partial list (stored videos,
+        or a refresh still streaming in): no status or render time is recorded for it.
+        """
         self.all_videos = fetched_videos
-        current_viewed_dict = load_viewed()
-        current_fetched_ids = {video['id'] for video in self.all_videos if video.get('id')}
-        viewed_ids_from_file = set(current_viewed_dict.keys())
-        valid_viewed_ids = viewed_ids_from_file.intersection(current_fetched_ids)
-        pruned_viewed_videos = {vid_id: True for vid_id in valid_viewed_ids}
-        if set(pruned_viewed_videos.keys()) != viewed_ids_from_file:
-             print(f"Pruning viewed list: Removed {len(viewed_ids_from_file - valid_viewed_ids)} old entries.")
-             save_viewed(pruned_viewed_videos)
-             self.viewed_videos = pruned_viewed_videos
-        else:
-             self.viewed_videos = current_viewed_dict
-        videos_to_display = [v for v in self.all_videos if v.get('id') and v['id'] not in self.viewed_videos]
-        for widget in self.scrollable_frame.winfo_children(): widget.destroy()
-        self.checkbox_vars.clear()
+        render_start = time.perf_counter()
+        self.unviewed_videos = [v for v in self.all_videos if v.id and v.id not in self.viewed_videos]
+        if final: # Listed viewed videos must not expire and come back as new
+            self.viewed_videos.touch(video.id for video in self.all_videos if video.id)
+        if self.video_index.update(self.all_videos):
+            self.channel_filter_box.config(values=[FILTER_ALL_CHANNELS] + self.video_index.channel_names())
+        videos_to_display, remaining = self.current_page()
+        added, removed = self.video_list.update_videos(videos_to_display)
+        self.video_list.set_more(remaining, self.page_size)
+        if final:
+            self.fetcher.metrics.record_render((time.perf_counter() - render_start) * 1000)
+        self.checked_ids.intersection_update(video.id for video in videos_to_display)
+        if not final:
+            if not videos_to_display: self.video_list.set_message("Fetching feeds...")
+            return
         if not videos_to_display:
             message = "No new videos found."
             if error_count > 0: message += f"\n({error_count} feed errors occurred - check console)."
+            elif not self.all_videos and error_count == 0 and not self.view_feed_urls and self.feeds_data: message = "No feeds in this group."
             elif not self.all_videos and error_count == 0: message = "No videos found in feeds. Add RSS feed URLs."
+            elif self.unviewed_videos: message = "No videos match the current filter."
             elif self.all_videos: message = "All fetched videos have been marked as viewed."
-            ttk.Label(self.scrollable_frame, text=message, wraplength=700).pack(pady=20, padx=10) # Use wraplength approx
-        else:
-            for video in videos_to_display:
-                video_id = video.get("id")
-                item_frame = ttk.Frame(self.scrollable_frame, padding=(5, 3), style='Item.TFrame')
-                item_frame.pack(fill=tk.X, pady=(0, 5), padx=3)
-                var = tk.BooleanVar(value=False)
-                self.checkbox_vars[video_id] = var
-                chk = ttk.Checkbutton(item_frame, variable=var, command=lambda v_id=video_id: self.toggle_viewed(v_id), style='TCheckbutton')
-                chk.pack(side=tk.LEFT, padx=(0, 8))
-                text_frame = ttk.Frame(item_frame); text_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
-                title_label = ttk.Label(text_frame, text=video.get('title', 'No Title'), style='Link.TLabel', cursor="hand2", wraplength=700, justify=tk.LEFT)
-                title_label.pack(anchor="w", fill=tk.X, pady=(0, 2))
-                title_label.bind("<Button-1>", lambda e, link=video.get('link', '#'): self.open_link(link))
-                info_text = f"Channel: {video.get('channel_title', 'Unknown')} | Published: {video.get('published_str', 'Unknown')}"
-                info_label = ttk.Label(text_frame, text=info_text, style='Info.TLabel', wraplength=700, justify=tk.LEFT)
-                info_label.pack(anchor="w", fill=tk.X)
-        status_text = f"Status: Displaying {len(videos_to_display)} new videos."
+            self.video_list.set_message(message)
+        status_text = self.display_status(videos_to_display, remaining) + f" (+{added}/-{removed})"
         if error_count > 0: status_text += f" ({error_count} feed errors)"
+        paused = self.fetcher.health.paused_count(self.view_feed_urls)
+        if paused: status_text += f" ({paused} failing feeds paused)"
+        if self.timed_out_feeds: status_text += self.timed_out_status()
         self.status_label.config(text=status_text)
-        self.root.after(100, self.update_scroll_region)
-
-    # --- update_scroll_region method (Unchanged) ---
-    def update_scroll_region(self):
-        canvas = self.scrollable_frame.master
-        if canvas and canvas.winfo_exists():
-             canvas.configure(scrollregion=canvas.bbox("all"))
+        self.sync_scheduler()
+
+    # --- *** NEW Methods: search & filter *** ---
+    def filter_videos(self, videos):
+        """Lazily applies the search bar and facets to videos (sorted newest first), keeping their order."""
+        max_age = FILTER_DATE_RANGES.get(self.date_filter_var.get())
+        end = len(videos)
+        if max_age:
+            # Newest first, undated last: the date facet is a cut-off point in the list
+            since = (True, time.time() - max_age.total_seconds())
+            start, end = 0, len(videos)
+            while start < end: # Binary search for the first older video (bisect's key= needs Python 3.10)
+                middle = (start + end) // 2
+                if video_sort_key(videos[middle]) < since: end = middle
+                else: start = middle + 1
+        channel = self.channel_filter_var.get()
+        matches = self.video_index.search(self.search_var.get(), channel=None if channel == FILTER_ALL_CHANNELS else channel)
+        videos = itertools.islice(videos, end)
+        if matches is None:
+            return videos
+        return (video for video in videos if video.id in matches)
+
+    def current_page(self):
+        """Returns (videos to display, number of further matches): the first display_limit filtered unviewed videos."""
+        matching = self.filter_videos(self.unviewed_videos)
+        page = list(itertools.islice(matching, self.display_limit))
+        return page, sum(1 for _ in matching) # Only counted, never materialized
+
+    def apply_filter(self):
+        """Re-filters the current videos after the search text or a facet changed."""
+        videos_to_display, remaining = self.current_page()
+        self.video_list.update_videos(videos_to_display)
+        self.video_list.set_more(remaining, self.page_size)
+        if videos_to_display:
+            self.video_list.set_message("")
+        elif self.unviewed_videos:
+            self.video_list.set_message("No videos match the current filter.")
+        if self.refresh_progress is None: # Don't overwrite the refresh progress
+            self.status_label.config(text=self.display_status(videos_to_display, remaining))
+
+    def display_status(self, videos_to_display, remaining):
+        matching = len(videos_to_display) + remaining
+        if remaining: status_text = f"Status: Displaying {len(videos_to_display)} of {matching} new videos."
+        else: status_text = f"Status: Displaying {matching} new videos."
+        if matching != len(self.unviewed_videos): status_text += f" Filtered from {len(self.unviewed_videos)}."
+        return status_text
+
+    def on_filter_changed(self):
+        self.display_limit = self.page_size # A new filter starts at its first page
+        self.apply_filter()
+
+    def load_more(self):
+        """Adds the next page of videos to the list."""
+        self.display_limit += self.page_size
+        self.apply_filter()
+
+    def clear_filter(self):
+        self.search_var.set("")
+        self.channel_filter_var.set(FILTER_ALL_CHANNELS)
+        self.date_filter_var.set("Any time")
+
+    # --- *** NEW Method: mark_shown_viewed *** ---
+    def mark_shown_viewed(self):
+        """Marks every video matching the filter (e.g. one channel), loaded into the list or not, as viewed."""
+        shown_ids = [video.id for video in self.filter_videos(self.unviewed_videos)]
+        if not shown_ids:
+            return
+        channel = self.channel_filter_var.get()
+        what = f"all {len(shown_ids)} listed videos" + (f" from {channel}" if channel != FILTER_ALL_CHANNELS else "")
+        if not messagebox.askyesno("Mark as Viewed", f"Mark {what} as viewed?"):
+            return
+        self.viewed_videos.mark_many(shown_ids) # One write for the whole batch
+        self.viewed_videos.flush()
+        shown = set(shown_ids)
+        self.checked_ids -= shown
+        self.unviewed_videos = [video for video in self.unviewed_videos if video.id not in shown]
+        self.apply_filter()
+        if not self.unviewed_videos and self.all_videos:
+            self.video_list.set_message("All fetched videos have been marked as viewed.")
+
+    # --- *** NEW Method: sync_scheduler *** ---
+    def sync_scheduler(self):
+        """Hands the selected group's feeds and their publish history to the background poller."""
+        history = {}
+        for video in self.all_videos:
+            history.setdefault(video.feed_url, []).append(video.published)
+        self.scheduler.update_feeds(set(self.view_feed_urls), history)
+
+    # --- *** NEW Method: merge_polled_feed *** ---
+    def merge_polled_feed(self, url, feed_data):
+        """Merges one feed fetched by the background poller into the displayed videos."""
+        feed_names = {feed_info['url']: feed_info.get('name', "Unknown Channel") for feed_info in self.feeds_data}
+        if url not in feed_names or url not in self.view_feed_urls:
+            return # Deleted meanwhile, or polled for a group that is no longer shown
+        posts = [post for post in feed_data.get("posts", []) if post.id]
+        known_ids = {video.id for video in self.all_videos if video.feed_url == url}
+        if {post.id for post in posts} <= known_ids:
+            return # Nothing new
+        for post in posts:
+            post.set_source(feed_names[url], url)
+        self.video_store.upsert(posts)
+        self.merge_feed_posts({url: posts}, final=self.refresh_progress is None) # Mid-refresh the list is partial
 
     # --- open_link method (Unchanged) ---
     def open_link(self, url):
         if url and url != "#":
+            import webbrowser # Slow to import and only needed once a video is opened
             try: webbrowser.open_new_tab(url)
             except Exception as e: messagebox.showerror("Error", f"Could not open link:\n{url}\nError: {e}")
         else: messagebox.showwarning("No Link", "This video entry does not have a valid link.")
 
-    # --- toggle_viewed method (Unchanged) ---
-    def toggle_viewed(self, video_id):
+    # --- toggle_viewed method (MODIFIED - called by the recycled list rows) ---
+    def toggle_viewed(self, video_id, checked):
         if not video_id: print("Warning: Toggle view without ID."); return
-        if video_id in self.checkbox_vars:
-            if self.checkbox_vars[video_id].get(): # If checked
-                if video_id not in self.viewed_videos:
-                    self.viewed_videos[video_id] = True
-                    save_viewed(self.viewed_videos)
-                    print(f"Marked as viewed: {video_id}")
-            # Else (unchecked) - do nothing in this workflow
-        else: print(f"Error: Checkbox variable not found for video ID {video_id}")
+        if checked:
+            self.checked_ids.add(video_id)
+            if self.viewed_videos.mark(video_id): # Saved in a batch by the store
+                print(f"Marked as viewed: {video_id}")
+        else:
+            self.checked_ids.discard(video_id) # Stays in viewed.json, as before
 
     # --- show_feeds_list method (MODIFIED - display name & URL) ---
     def show_feeds_list(self):
@@ -515,7 +3206,7 @@ class YouTubeRSSViewerApp:
                                   highlightbackground=COLOR_BORDER,
                                   highlightcolor=COLOR_LINK,
                                   font=self.font_base,
-                                  selectmode=tk.SINGLE)
+                                  selectmode=tk.EXTENDED) # Several feeds can be moved to a group at once
 
         listbox_scrollbar_y.config(command=feed_listbox.yview, bg=COLOR_WIDGET_BG, troughcolor=COLOR_DARK_BG, activebackground=COLOR_SELECT_BG)
         listbox_scrollbar_x.config(command=feed_listbox.xview, bg=COLOR_WIDGET_BG, troughcolor=COLOR_DARK_BG, activebackground=COLOR_SELECT_BG) # Config horizontal
@@ -528,9 +3219,8 @@ class YouTubeRSSViewerApp:
 
         # --- Populate listbox with formatted strings ---
         if self.feeds_data:
-            for feed_info in self.feeds_data:
-                display_text = f"{feed_info.get('name', 'Unknown Name')}  —  {feed_info.get('url', 'Unknown URL')}"
-                feed_listbox.insert(tk.END, display_text)
+            for index, feed_info in enumerate(self.feeds_data):
+                self.insert_feed_line(feed_listbox, index, feed_info)
         else:
             feed_listbox.insert(tk.END, "No feeds added yet.")
             feed_listbox.config(state=tk.DISABLED)
@@ -542,6 +3232,17 @@ class YouTubeRSSViewerApp:
         delete_button.pack(side=tk.LEFT, padx=5)
         if not self.feeds_data: delete_button.config(state=tk.DISABLED)
 
+        retry_button = ttk.Button(button_frame, text="Retry Selected", command=lambda lb=feed_listbox: self.retry_selected_feed(lb), style='TButton')
+        retry_button.pack(side=tk.LEFT, padx=5)
+        if not self.feeds_data: retry_button.config(state=tk.DISABLED)
+
+        group_var = tk.StringVar()
+        group_box = ttk.Combobox(button_frame, textvariable=group_var, values=self.group_names(), width=16)
+        group_box.pack(side=tk.LEFT, padx=(15, 0))
+        group_button = ttk.Button(button_frame, text="Set Group", command=lambda lb=feed_listbox: self.set_selected_feeds_group(lb, group_var.get()), style='TButton')
+        group_button.pack(side=tk.LEFT, padx=5)
+        if not self.feeds_data: group_button.config(state=tk.DISABLED)
+
         close_button = ttk.Button(button_frame, text="Close", command=self.close_feeds_window, style='TButton')
         close_button.pack(side=tk.LEFT, padx=5)
 
@@ -550,6 +3251,64 @@ class YouTubeRSSViewerApp:
         self.feeds_list_window.focus_set()
         self.feeds_list_window.wait_window()
 
+    # --- *** NEW Methods: feed health in the feeds window *** ---
+    def insert_feed_line(self, listbox_widget, index, feed_info):
+        """Inserts a feed's line at index, in red if the feed has been failing."""
+        listbox_widget.insert(index, self.feed_list_text(feed_info))
+        if self.fetcher.health.state(feed_info.get('url'))[1]:
+            listbox_widget.itemconfig(index, fg=COLOR_ERROR)
+
+    def feed_list_text(self, feed_info):
+        """Listbox line for a feed: group, name and URL, plus its failure state if it has been failing."""
+        text = f"{feed_info.get('name', 'Unknown Name')}  —  {feed_info.get('url', 'Unknown URL')}"
+        if feed_info.get('group'): text = f"[{feed_info['group']}]  {text}"
+        state, entry = self.fetcher.health.state(feed_info.get('url'))
+        if entry is None:
+            return text
+        if state == FeedHealth.OPEN:
+            retry_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["retry_at"]))
+            return f"{text}  [paused: {entry['failures']} failures, retry {retry_at}: {entry.get('last_error')}]"
+        if state == FeedHealth.HALF_OPEN:
+            return f"{text}  [retrying: {entry['failures']} failures: {entry.get('last_error')}]"
+        return f"{text}  [{entry['failures']} failed: {entry.get('last_error')}]"
+
+    def retry_selected_feed(self, listbox_widget):
+        """Clears the selected feed's failure history and fetches it right away."""
+        selected_indices = listbox_widget.curselection()
+        if not selected_indices or not 0 <= selected_indices[0] < len(self.feeds_data):
+            messagebox.showwarning("No Selection", "Please select a feed from the list to retry.", parent=self.feeds_list_window)
+            return
+        index = selected_indices[0]
+        feed_info = self.feeds_data[index]
+        url = feed_info['url']
+        self.fetcher.health.reset(url)
+        listbox_widget.delete(index)
+        self.insert_feed_line(listbox_widget, index, feed_info)
+        limit = self.poll_limit
+        # Merged like a poll result; if it fails again, this list shows it the next time it's opened
+        Thread(target=lambda: self.result_queue.put(("poll", url, self.fetcher.fetch_single_feed(url, limit))), daemon=True).start()
+
+    def set_selected_feeds_group(self, listbox_widget, group):
+        """Moves the selected feeds into group (a blank name takes them out of their group)."""
+        indices = [index for index in listbox_widget.curselection() if index < len(self.feeds_data)]
+        if not indices:
+            messagebox.showwarning("No Selection", "Please select the feeds to move to the group.", parent=self.feeds_list_window)
+            return
+        group = group.strip()
+        if group in (FILTER_ALL_GROUPS, FILTER_UNGROUPED):
+            messagebox.showwarning("Reserved Name", f'"{group}" can\'t be used as a group name.', parent=self.feeds_list_window)
+            return
+        for index in indices:
+            feed_info = self.feeds_data[index]
+            if group: feed_info['group'] = group
+            else: feed_info.pop('group', None)
+            listbox_widget.delete(index)
+            self.insert_feed_line(listbox_widget, index, feed_info)
+            listbox_widget.selection_set(index)
+        save_feeds(self.feeds_data)
+        self.update_group_choices()
+        self.show_group() # The selected group may have gained or lost feeds
+
     # --- delete_selected_feed method (MODIFIED - uses index) ---
     def delete_selected_feed(self, listbox_widget):
         """Deletes the selected feed using its index."""
@@ -578,6 +3337,14 @@ class YouTubeRSSViewerApp:
             try:
                 # Remove from the internal list self.feeds_data using index
                 del self.feeds_data[selected_index]
+                self.fetcher.health.reset(url_to_delete)
+                self.fetcher.prune(feed_info['url'] for feed_info in self.feeds_data)
+                self.feed_videos.pop(url_to_delete, None)
+                self.fetched_feeds.discard(url_to_delete)
+                self.view_feed_urls.discard(url_to_delete) # The poller and later refreshes drop it too
+                group = self.current_group
+                self.update_group_choices()
+                self.feed_url_index = {feed_url_key(feed_info['url']) for feed_info in self.feeds_data}
                 print(f"Removed feed: {name_to_delete} - {url_to_delete}")
 
                 # Remove from the listbox visually using index
@@ -585,6 +3352,14 @@ class YouTubeRSSViewerApp:
 
                 # Save the updated list to the file
                 save_feeds(self.feeds_data)
+                if self.current_group != group: # That was the group's last feed: show all groups instead
+                    self.config["group"] = self.current_group
+                    save_config(self.config)
+                    self.show_group()
+                else: # Its videos would otherwise be kept by every later refresh of the group
+                    self.update_video_list([video for video in self.all_videos if video.feed_url != url_to_delete], 0,
+                                           final=self.refresh_progress is None) # Don't end a running refresh's status
+                self.sync_scheduler()
 
                 # Disable delete button if list becomes empty
                 if not self.feeds_data:
@@ -601,6 +3376,130 @@ class YouTubeRSSViewerApp:
                  print(f"Error deleting feed {url_to_delete}: {e}")
 
 
+    # --- *** NEW METHOD: show_diagnostics *** ---
+    DIAGNOSTICS_COLUMNS = (
+        # (column id, heading, width, record field)
+        ("feed", "Feed", 200, "name"), ("status", "Status", 60, "status"), ("http", "HTTP", 50, "http_status"),
+        ("cache", "Cache", 50, "cache"), ("entries", "Entries", 60, "entries"), ("bytes", "Bytes", 70, "bytes"),
+        ("dns", "DNS ms", 65, "dns_ms"), ("connect", "Conn. ms", 70, "connect_ms"), ("tls", "TLS ms", 65, "tls_ms"),
+        ("wait", "Wait ms", 65, "wait_ms"), ("transfer", "Xfer ms", 65, "transfer_ms"), ("parse", "Parse ms", 70, "parse_ms"),
+        ("total", "Total ms", 70, "total_ms"), ("conn", "Socket", 55, "connection"), ("error", "Error", 200, "error"),
+    )
+
+    def show_diagnostics(self):
+        """Shows per-feed fetch metrics in a sortable table, with JSON/Prometheus export."""
+        if self.diagnostics_window and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.lift()
+            self.populate_diagnostics()
+            return
+
+        self.setup_treeview_style()
+        self.diagnostics_window = tk.Toplevel(self.root)
+        self.diagnostics_window.title("Feed Diagnostics")
+        self.diagnostics_window.geometry("1100x500")
+        self.diagnostics_window.config(bg=COLOR_DARK_BG)
+        self.diagnostics_window.transient(self.root)
+
+        self.diagnostics_summary = ttk.Label(self.diagnostics_window, text="", justify=tk.LEFT)
+        self.diagnostics_summary.pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        table_frame = ttk.Frame(self.diagnostics_window)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        columns = [column for column, _, _, _ in self.DIAGNOSTICS_COLUMNS]
+        tree = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="browse")
+        for column, heading, width, _ in self.DIAGNOSTICS_COLUMNS:
+            tree.heading(column, text=heading, command=lambda c=column: self.sort_diagnostics(c))
+            tree.column(column, width=width, anchor=tk.W if column in ("feed", "error") else tk.E, stretch=column in ("feed", "error"))
+        scrollbar_y = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview, style='Vertical.TScrollbar')
+        tree.configure(yscrollcommand=scrollbar_y.set)
+        scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.diagnostics_tree = tree
+        self.diagnostics_sort = ("total", True) # Slowest feeds first
+
+        button_frame = ttk.Frame(self.diagnostics_window, style='TFrame')
+        button_frame.pack(pady=10)
+        ttk.Button(button_frame, text="Reload", command=self.populate_diagnostics, style='TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Export JSON...", command=lambda: self.export_diagnostics("json"), style='TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Export Prometheus...", command=lambda: self.export_diagnostics("prometheus"), style='TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Close", command=self.close_diagnostics_window, style='TButton').pack(side=tk.LEFT, padx=5)
+
+        self.diagnostics_window.protocol("WM_DELETE_WINDOW", self.close_diagnostics_window)
+        self.populate_diagnostics()
+
+    def populate_diagnostics(self):
+        """Fills the diagnostics table from the fetcher's metrics, in the current sort order."""
+        records, last_refresh = self.fetcher.metrics.snapshot()
+        feed_names = {feed_info['url']: feed_info.get('name', feed_info['url']) for feed_info in self.feeds_data}
+        for record in records:
+            record["name"] = feed_names.get(record["url"], record["url"])
+
+        if last_refresh:
+            render = f"{last_refresh['render_ms']:.0f} ms" if last_refresh.get("render_ms") is not None else "n/a"
+            summary = (f"Last refresh: {last_refresh['feeds']} feeds in {last_refresh['seconds']:.2f} s, "
+                       f"{last_refresh['errors']} errors, {last_refresh.get('timed_out', 0)} past the deadline, list update {render}.")
+        else:
+            summary = "No refresh recorded yet."
+        hits = sum(1 for record in records if record.get("cache") == "hit")
+        reused = sum(1 for record in records if record.get("connection") == "reused")
+        self.diagnostics_summary.config(text=f"{summary}  Feeds with metrics: {len(records)} ({hits} cache hits, {reused} reused connections).")
+
+        column, descending = self.diagnostics_sort
+        field = next(f for c, _, _, f in self.DIAGNOSTICS_COLUMNS if c == column)
+        numeric = [r for r in records if isinstance(r.get(field), (int, float))]
+        other = [r for r in records if not isinstance(r.get(field), (int, float))]
+        numeric.sort(key=lambda r: r[field], reverse=descending)
+        other.sort(key=lambda r: str(r.get(field) or ""), reverse=descending)
+        tree = self.diagnostics_tree
+        tree.delete(*tree.get_children())
+        for record in numeric + other: # Missing values always sort last
+            values = []
+            for _, _, _, f in self.DIAGNOSTICS_COLUMNS:
+                value = record.get(f)
+                if value is None: value = ""
+                elif f.endswith("_ms"): value = f"{value:.1f}"
+                values.append(value)
+            tree.insert("", tk.END, values=values)
+
+    def sort_diagnostics(self, column):
+        """Sorts the diagnostics table by column, toggling the direction on repeated clicks."""
+        current_column, descending = self.diagnostics_sort
+        self.diagnostics_sort = (column, not descending if column == current_column else True)
+        self.populate_diagnostics()
+
+    def export_diagnostics(self, fmt):
+        """Saves the fetch metrics as JSON or Prometheus text format."""
+        extension = ".json" if fmt == "json" else ".prom"
+        path = filedialog.asksaveasfilename(parent=self.diagnostics_window, defaultextension=extension,
+                                            initialfile=f"feed_metrics{extension}",
+                                            filetypes=[("JSON", "*.json")] if fmt == "json" else [("Prometheus text", "*.prom *.txt")])
+        if not path:
+            return
+        metrics = self.fetcher.metrics
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(metrics.to_json() if fmt == "json" else metrics.to_prometheus())
+        except Exception as e:
+            messagebox.showerror("Export Failed", f"Could not write {path}:\n{e}", parent=self.diagnostics_window)
+
+    def close_diagnostics_window(self):
+        if self.diagnostics_window and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.destroy()
+        self.diagnostics_window = None
+
+    # --- *** NEW METHOD: on_close *** ---
+    def on_close(self):
+        """Writes pending viewed changes before the main window closes."""
+        self.scheduler.stop()
+        self.root.after_cancel(self.drain_after_id)
+        self.video_store.close()
+        if self.fetcher is not None: # Closed before finish_startup loaded anything: nothing to save
+            self.viewed_videos.flush()
+            self.fetcher.save_cache() # Keeps what the poller learned since the last refresh
+            self.fetcher.close()
+        if self.thumbnails is not None: self.thumbnails.close()
+        self.root.destroy()
+
     # --- *** NEW METHOD: close_feeds_window *** ---
     def close_feeds_window(self):
         """Helper method to destroy the feeds list window and reset the tracker."""
@@ -611,6 +3510,24 @@ class YouTubeRSSViewerApp:
 
 # --- Main Execution (Keep the exact same block from the dark theme version) ---
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = YouTubeRSSViewerApp(root)
-    root.mainloop()
+    if getattr(sys, "frozen", False): # PyInstaller build: its parse worker processes start here and must not run the app
+        import multiprocessing
+        multiprocessing.freeze_support()
+    startup_timer.mark("imports")
+    parser = argparse.ArgumentParser(description="YouTube RSS Feed Viewer")
+    parser.add_argument("--serve", action="store_true", help="Run headless, serving the merged feed over HTTP")
+    parser.add_argument("--host", default=SERVE_DEFAULT_HOST, help=f"Address to serve on (default {SERVE_DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=SERVE_DEFAULT_PORT, help=f"Port to serve on (default {SERVE_DEFAULT_PORT})")
+    parser.add_argument("--profile-startup", nargs="?", type=int, const=STARTUP_TARGET_MS, metavar="TARGET_MS",
+                        help=f"Time the launch up to the stored videos (no network), then quit; exit status 1 if "
+                             f"the first paint takes longer than TARGET_MS (default {STARTUP_TARGET_MS})")
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.host, args.port)
+    else:
+        root = tk.Tk()
+        startup_timer.mark("Tk started")
+        app = YouTubeRSSViewerApp(root, profile_startup=args.profile_startup is not None)
+        root.mainloop()
+        if args.profile_startup is not None:
+            sys.exit(0 if startup_timer.report(args.profile_startup) else 1)
@@ -0,0 +1,63 @@
+"""
+Compares feedparser with the fast YouTube Atom parser on the feed fixtures.
+
+    python benchmarks/bench_parser.py [--iterations N] [--limit N]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedparser
+from YouTubeRSSViewer import parse_youtube_feed, entry_epoch, DEFAULT_VIDEOS_PER_CHANNEL
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def summarize(feed, limit):
+    """Reduces a parse result to the fields the viewer uses, for comparing the two parsers."""
+    return (
+        feed.feed.get("title"), feed.feed.get("link"),
+        [(e.get("id"), e.get("title"), e.get("link"), entry_epoch(e))
+         for e in feed.entries[:limit]],
+    )
+
+
+def time_parser(parse, data, iterations):
+    """Returns the mean seconds per call of parse(data)."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(data)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=DEFAULT_VIDEOS_PER_CHANNEL)
+    args = parser.parse_args()
+
+    fixtures = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.xml")))
+    if not fixtures:
+        sys.exit(f"No fixtures found in {FIXTURES_DIR}")
+
+    print(f"{'fixture':<24}{'feedparser':>14}{'fast parser':>14}{'speedup':>10}")
+    total_slow = total_fast = 0.0
+    for path in fixtures:
+        with open(path, "rb") as f:
+            data = f.read()
+        # Both parsers must agree before their timings mean anything
+        if summarize(feedparser.parse(data), args.limit) != summarize(parse_youtube_feed(data, args.limit), args.limit):
+            sys.exit(f"Parsers disagree on {os.path.basename(path)}")
+        slow = time_parser(feedparser.parse, data, args.iterations)
+        fast = time_parser(lambda d: parse_youtube_feed(d, args.limit), data, args.iterations)
+        total_slow += slow; total_fast += fast
+        print(f"{os.path.basename(path):<24}{slow * 1000:>12.3f}ms{fast * 1000:>12.3f}ms{slow / fast:>9.1f}x")
+    print(f"{'total':<24}{total_slow * 1000:>12.3f}ms{total_fast * 1000:>12.3f}ms{total_slow / total_fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
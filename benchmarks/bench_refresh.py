@@ -0,0 +1,188 @@
+"""
+Times the refresh pipeline and list rendering against the local fake feed server.
+
+    python benchmarks/bench_refresh.py [--feeds 10,100,1000,5000] [--latency-ms N]
+                                       [--error-rate F] [--entries N] [--transport pooled|urllib]
+                                       [--output FILE]
+
+For each feed count it measures fetch_single_feed, the fetch_all_videos_thread pipeline
+(FeedFetcher.fetch_all + VideoStore.upsert) cold and warm (304s), and update_video_list
+in a real Tk window when a display is available (use xvfb-run on headless machines).
+Results are printed and written as JSON so they can be compared across versions.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import YouTubeRSSViewer as viewer
+from fake_feed_server import FakeFeedServer
+
+SINGLE_FEED_SAMPLES = 50
+
+
+def timings_summary(samples):
+    """Mean/p50/p95/max in milliseconds for a list of durations in seconds."""
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+TRANSPORTS = {"pooled": viewer.PooledTransport, "urllib": viewer.UrllibTransport}
+
+
+def bench_single_feed(server, count, limit, transport):
+    """Times cold fetch_single_feed calls on distinct feeds."""
+    fetcher = viewer.FeedFetcher(transport=TRANSPORTS[transport]())
+    samples = []
+    for index in range(min(count, SINGLE_FEED_SAMPLES)):
+        start = time.perf_counter()
+        fetcher.fetch_single_feed(server.feed_url(index), limit)
+        samples.append(time.perf_counter() - start)
+    return timings_summary(samples)
+
+
+def bench_pipeline(server, feeds_data, limit, workers, per_host, transport):
+    """Runs the fetch_all_videos_thread work twice: cold, then warm against the conditional GET cache."""
+    fetcher = viewer.FeedFetcher(max_workers=workers, per_host_connections=per_host, transport=TRANSPORTS[transport]())
+    store = viewer.VideoStore(":memory:")
+    results = {}
+    for run in ("cold", "warm"):
+        requests_before = server.requests
+        start = time.perf_counter()
+        videos, errors, _ = fetcher.fetch_all(feeds_data, limit)
+        store.upsert(videos)
+        results[run] = {
+            "seconds": round(time.perf_counter() - start, 4),
+            "videos": len(videos), "errors": errors,
+            "requests": server.requests - requests_before,
+        }
+    store.close()
+    fetcher.close()
+    return results, videos
+
+
+def bench_render(videos):
+    """Times update_video_list in a real app window, or explains why it was skipped."""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        return {"skipped": f"No display available ({e})"}
+    pil_available = viewer.PIL_AVAILABLE
+    viewer.PIL_AVAILABLE = False # Thumbnails would be downloaded from YouTube: keep the benchmark offline
+    try:
+        root.geometry("900x700")
+        app = viewer.YouTubeRSSViewerApp(root) # Runs in the benchmark's temp dir, with no feeds
+        root.update()
+        app.finish_startup() # Normally runs once the window is exposed; does nothing if it already has
+        app.scheduler.stop() # After finish_startup, which starts it
+
+        app.video_list.clear(); root.update()
+        start = time.perf_counter()
+        app.update_video_list(videos, 0); root.update()
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        app.update_video_list(list(videos), 0); root.update()
+        unchanged = time.perf_counter() - start
+
+        # Pretend the first five videos are new
+        start = time.perf_counter()
+        app.update_video_list(list(videos[5:]), 0); root.update()
+        app.update_video_list(list(videos), 0); root.update()
+        patched = (time.perf_counter() - start) / 2
+
+        scroll_samples = []
+        for _ in range(50):
+            start = time.perf_counter()
+            app.video_list.scroll(10); root.update()
+            scroll_samples.append(time.perf_counter() - start)
+        return {
+            "first_render_ms": round(first * 1000, 3),
+            "unchanged_refresh_ms": round(unchanged * 1000, 3),
+            "patched_refresh_ms": round(patched * 1000, 3),
+            "scroll": timings_summary(scroll_samples),
+            "row_widgets": len(app.video_list.rows),
+        }
+    finally:
+        viewer.PIL_AVAILABLE = pil_available
+        root.destroy()
+
+
+def git_version():
+    try:
+        return subprocess.check_output(["git", "describe", "--always", "--dirty"], cwd=REPO_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feeds", default="10,100,1000,5000", help="Comma separated feed counts")
+    parser.add_argument("--entries", type=int, default=15, help="Entries per synthetic feed")
+    parser.add_argument("--limit", type=int, default=viewer.DEFAULT_VIDEOS_PER_CHANNEL, help="Videos per channel")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of feeds answering 500")
+    parser.add_argument("--workers", type=int, default=viewer.DEFAULT_FETCH_WORKERS)
+    parser.add_argument("--per-host", type=int, default=viewer.DEFAULT_PER_HOST_CONNECTIONS)
+    parser.add_argument("--transport", choices=sorted(TRANSPORTS), default="pooled",
+                        help="HTTP transport: keep-alive pool or a new urllib connection per feed")
+    parser.add_argument("--no-render", action="store_true", help="Skip the Tk rendering benchmark")
+    parser.add_argument("--verbose", action="store_true", help="Show the viewer's own console output")
+    parser.add_argument("--output", default="bench_refresh.json", help="Where to write the JSON results")
+    args = parser.parse_args()
+    feed_counts = [int(count) for count in args.feeds.split(",") if count.strip()]
+    output = os.path.abspath(args.output)
+
+    report = {
+        "version": git_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "verbose")},
+        "results": [],
+    }
+    cwd = os.getcwd()
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    with tempfile.TemporaryDirectory() as work_dir, \
+            FakeFeedServer(entries=args.entries, latency_ms=args.latency_ms, error_rate=args.error_rate) as server:
+        os.chdir(work_dir) # The viewer reads and writes its data files in the working directory
+        try:
+            for count in feed_counts:
+                print(f"--- {count} feeds ---")
+                feeds_data = [{"url": server.feed_url(index), "name": f"Channel {index}"} for index in range(count)]
+                result = {"feeds": count}
+                with quiet: # The viewer prints a line per fetched feed
+                    result["fetch_single_feed"] = bench_single_feed(server, count, args.limit, args.transport)
+                    result["pipeline"], videos = bench_pipeline(server, feeds_data, args.limit, args.workers, args.per_host, args.transport)
+                    if not args.no_render:
+                        result["update_video_list"] = bench_render(videos)
+                report["results"].append(result)
+                print(json.dumps(result, indent=2))
+        finally:
+            os.chdir(cwd)
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
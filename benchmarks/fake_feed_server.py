@@ -0,0 +1,178 @@
+"""
+Local stand-in for YouTube's feed endpoint, serving synthetic channel Atom feeds.
+
+    python benchmarks/fake_feed_server.py [--port N] [--entries N] [--latency-ms N] [--error-rate F]
+
+Feeds live at /feeds/videos.xml?channel_id=UC<anything>. Every response carries an ETag,
+and requests that send it back get 304 Not Modified, like the real server.
+"""
+import argparse
+import hashlib
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+FEED_PATH = "/feeds/videos.xml"
+VIDEO_ID_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+
+
+def build_feed(channel_id, entries=15, now=None):
+    """Returns a deterministic YouTube-style Atom feed (bytes) for channel_id."""
+    rng = random.Random(channel_id)
+    now = now or datetime(2026, 10, 1, 12, tzinfo=timezone.utc)
+    name = f"Channel {channel_id[2:]}"
+    cadence_hours = rng.choice([6, 24, 72, 168, 720])
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">',
+        f' <link rel="self" href="http://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"/>',
+        f' <id>yt:channel:{channel_id[2:]}</id>',
+        f' <yt:channelId>{channel_id[2:]}</yt:channelId>',
+        f' <title>{escape(name)}</title>',
+        f' <link rel="alternate" href="https://www.youtube.com/channel/{channel_id}"/>',
+        f' <author><name>{escape(name)}</name><uri>https://www.youtube.com/channel/{channel_id}</uri></author>',
+        ' <published>2015-01-01T00:00:00+00:00</published>',
+    ]
+    for i in range(entries):
+        video_id = "".join(rng.choice(VIDEO_ID_ALPHABET) for _ in range(11))
+        published = now - timedelta(hours=cadence_hours * i + rng.randint(0, 5))
+        title = escape(f"{name} video {entries - i}: {rng.choice(['Intro', 'Deep dive', 'Q&A', 'Update'])}")
+        description = escape(f"Description of video {entries - i} from {name}.\n") * rng.randint(2, 6)
+        stamp = published.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        lines += [
+            ' <entry>',
+            f'  <id>yt:video:{video_id}</id>',
+            f'  <yt:videoId>{video_id}</yt:videoId>',
+            f'  <yt:channelId>{channel_id[2:]}</yt:channelId>',
+            f'  <title>{title}</title>',
+            f'  <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>',
+            f'  <author><name>{escape(name)}</name><uri>https://www.youtube.com/channel/{channel_id}</uri></author>',
+            f'  <published>{stamp}</published>',
+            f'  <updated>{stamp}</updated>',
+            '  <media:group>',
+            f'   <media:title>{title}</media:title>',
+            f'   <media:thumbnail url="https://i1.ytimg.com/vi/{video_id}/hqdefault.jpg" width="480" height="360"/>',
+            f'   <media:description>{description}</media:description>',
+            f'   <media:community><media:statistics views="{rng.randint(10, 999999)}"/></media:community>',
+            '  </media:group>',
+            ' </entry>',
+        ]
+    lines.append('</feed>')
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class FakeFeedServer:
+    """
+    Threaded HTTP server for feed benchmarks. latency_ms delays every response,
+    error_rate is the fraction of channels that always answer 500 (chosen by hash,
+    so the same channels fail on every run).
+    """
+    def __init__(self, host="127.0.0.1", port=0, entries=15, latency_ms=0, error_rate=0.0):
+        self.entries = entries
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self._feeds = {} # channel_id -> (body, etag)
+        self._feeds_lock = threading.Lock()
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True # Like real servers; otherwise keep-alive replies stall on delayed ACKs
+
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, *args):
+                pass # Keep benchmark output clean
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    def feed_url(self, index):
+        """URL of the index-th synthetic channel."""
+        return f"http://127.0.0.1:{self.port}{FEED_PATH}?channel_id=UCbench{index:017d}"
+
+    def is_failing(self, channel_id):
+        digest = hashlib.sha1(channel_id.encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32 < self.error_rate
+
+    def _feed(self, channel_id):
+        with self._feeds_lock:
+            feed = self._feeds.get(channel_id)
+            if feed is None:
+                body = build_feed(channel_id, self.entries)
+                feed = (body, '"' + hashlib.sha1(body).hexdigest()[:16] + '"')
+                self._feeds[channel_id] = feed
+            return feed
+
+    def _handle(self, handler):
+        with self._feeds_lock:
+            self.requests += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        parts = urlsplit(handler.path)
+        channel_id = parse_qs(parts.query).get("channel_id", [""])[0]
+        if parts.path != FEED_PATH or not channel_id.startswith("UC"):
+            self._send(handler, 404, b"Not Found")
+        elif self.is_failing(channel_id):
+            self._send(handler, 500, b"Internal Server Error")
+        else:
+            body, etag = self._feed(channel_id)
+            if handler.headers.get("If-None-Match") == etag:
+                self._send(handler, 304, b"", {"ETag": etag})
+            else:
+                self._send(handler, 200, body, {"ETag": etag, "Content-Type": "text/xml; charset=UTF-8"})
+
+    def _send(self, handler, status, body, headers=None):
+        handler.send_response(status)
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if body:
+            handler.wfile.write(body)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-feed-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--entries", type=int, default=15)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    with FakeFeedServer(port=args.port, entries=args.entries, latency_ms=args.latency_ms, error_rate=args.error_rate) as server:
+        print(f"Serving fake feeds, e.g. {server.feed_url(0)} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
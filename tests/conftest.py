@@ -0,0 +1,5 @@
+"""Makes the viewer importable from the tests, which live one folder below it."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,85 @@
+"""FeedHealth: the per-feed circuit breaker's state transitions and cooldowns."""
+from YouTubeRSSViewer import (BREAKER_BASE_COOLDOWN, BREAKER_FAILURE_THRESHOLD, BREAKER_MAX_COOLDOWN,
+                              FeedHealth)
+
+URL = "https://www.youtube.com/feeds/videos.xml?channel_id=UC1"
+NOW = 1_700_000_000
+
+
+def failed(times, now=NOW):
+    health = FeedHealth()
+    for _ in range(times):
+        health.record_failure(URL, "HTTP 404", now=now)
+    return health
+
+
+def test_stays_closed_below_threshold():
+    health = failed(BREAKER_FAILURE_THRESHOLD - 1)
+    assert health.state(URL, now=NOW)[0] == FeedHealth.CLOSED
+    assert health.allow(URL, now=NOW)
+    assert health.paused_count([URL], now=NOW) == 0
+
+
+def test_opens_at_threshold_for_base_cooldown():
+    health = failed(BREAKER_FAILURE_THRESHOLD)
+    state, entry = health.state(URL, now=NOW)
+    assert state == FeedHealth.OPEN
+    assert entry["retry_at"] == NOW + BREAKER_BASE_COOLDOWN
+    assert entry["last_error"] == "HTTP 404"
+    assert not health.allow(URL, now=NOW)
+    assert health.paused_count([URL], now=NOW) == 1
+
+
+def test_cooldown_doubles_and_is_capped():
+    assert failed(BREAKER_FAILURE_THRESHOLD + 2).state(URL, now=NOW)[1]["retry_at"] == NOW + 4 * BREAKER_BASE_COOLDOWN
+    assert failed(BREAKER_FAILURE_THRESHOLD + 30).state(URL, now=NOW)[1]["retry_at"] == NOW + BREAKER_MAX_COOLDOWN
+
+
+def test_half_open_lets_a_single_trial_through():
+    health = failed(BREAKER_FAILURE_THRESHOLD)
+    later = NOW + BREAKER_BASE_COOLDOWN
+    assert health.state(URL, now=later)[0] == FeedHealth.HALF_OPEN
+    assert health.allow(URL, now=later)
+    assert not health.allow(URL, now=later) # Trial still in flight
+    health.release(URL)
+    assert health.allow(URL, now=later)
+
+
+def test_failed_trial_reopens_for_longer():
+    health = failed(BREAKER_FAILURE_THRESHOLD)
+    later = NOW + BREAKER_BASE_COOLDOWN
+    assert health.allow(URL, now=later)
+    health.record_failure(URL, "timed out", now=later)
+    state, entry = health.state(URL, now=later)
+    assert state == FeedHealth.OPEN
+    assert entry["retry_at"] == later + 2 * BREAKER_BASE_COOLDOWN
+
+
+def test_success_closes_and_forgets():
+    health = failed(BREAKER_FAILURE_THRESHOLD)
+    assert health.allow(URL, now=NOW + BREAKER_BASE_COOLDOWN)
+    health.record_success(URL)
+    assert health.state(URL, now=NOW) == (FeedHealth.CLOSED, None)
+    assert health.entries == {}
+
+
+def test_reset_and_prune_forget_feeds():
+    health = failed(BREAKER_FAILURE_THRESHOLD)
+    health.reset(URL)
+    assert health.allow(URL, now=NOW)
+    health.record_failure(URL, "HTTP 500", now=NOW)
+    health.prune({"https://example.com/other"})
+    assert health.entries == {}
+
+
+def test_snapshot_only_when_changed():
+    health = FeedHealth()
+    assert health.snapshot_if_dirty() is None
+    health.record_failure(URL, "HTTP 500", now=NOW)
+    snapshot = health.snapshot_if_dirty()
+    assert snapshot[URL]["failures"] == 1
+    assert health.snapshot_if_dirty() is None
+    snapshot[URL]["failures"] = 99 # A copy: saving it must not race with fetches
+    assert health.entries[URL]["failures"] == 1
+    health.record_success("https://example.com/healthy") # No entry, nothing to save
+    assert health.snapshot_if_dirty() is None
@@ -0,0 +1,86 @@
+"""FeedFetcher and the circuit breaker: which download errors count against a feed."""
+import os
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from YouTubeRSSViewer import BREAKER_FAILURE_THRESHOLD, FeedFetcher, FeedHealth
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures",
+                       "daily_uploads.xml")
+
+
+@pytest.fixture
+def silent_url():
+    """A host that accepts connections but never answers."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    yield f"http://127.0.0.1:{server.getsockname()[1]}/feeds/videos.xml?channel_id=UCsilent"
+    server.close()
+
+
+@pytest.fixture
+def refused_url():
+    """A port nobody listens on."""
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return f"http://127.0.0.1:{port}/feeds/videos.xml?channel_id=UCrefused"
+
+
+@pytest.fixture
+def good_url():
+    with open(FIXTURE, "rb") as f:
+        body = f.read()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/feeds/videos.xml?channel_id=UCgood"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # fetch_all saves the feed cache and health to the current folder
+    fetcher = FeedFetcher(feed_timeout=0.3)
+    yield fetcher
+    fetcher.close()
+
+
+def test_silent_host_trips_the_breaker(fetcher, silent_url):
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        result = fetcher.fetch_single_feed(silent_url, skip_open=True)
+        assert result["error_kind"] == "timeout"
+    assert fetcher.health.state(silent_url)[0] == FeedHealth.OPEN
+    assert fetcher.fetch_single_feed(silent_url, skip_open=True)["skipped"] # No further timeouts to wait for
+
+
+def test_connection_errors_while_offline_never_count(fetcher, refused_url):
+    for _ in range(BREAKER_FAILURE_THRESHOLD + 1):
+        fetcher.fetch_all([{"url": refused_url, "name": "Refused"}])
+        fetcher.fetch_single_feed(refused_url, skip_open=True)
+    assert fetcher.health.state(refused_url) == (FeedHealth.CLOSED, None)
+
+
+def test_connection_errors_count_when_other_feeds_load(fetcher, refused_url, good_url):
+    feeds = [{"url": refused_url, "name": "Refused"}, {"url": good_url, "name": "Good"}]
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        videos, errors, _ = fetcher.fetch_all(feeds)
+        assert videos and errors == 1
+    assert fetcher.health.state(refused_url)[0] == FeedHealth.OPEN
+    assert fetcher.health.state(good_url) == (FeedHealth.CLOSED, None)
@@ -0,0 +1,29 @@
+"""merge_newest_first: merging per-feed lists into one newest-first list."""
+from YouTubeRSSViewer import VideoRecord, merge_newest_first
+
+
+def vid(video_id, published):
+    return VideoRecord(video_id, video_id, published=published)
+
+
+def ids(videos):
+    return [video.id for video in videos]
+
+
+def test_merges_sorted_lists_newest_first():
+    a = [vid("a3", 30), vid("a1", 10)]
+    b = [vid("b4", 40), vid("b2", 20)]
+    assert ids(merge_newest_first(a, b)) == ["b4", "a3", "b2", "a1"]
+
+
+def test_undated_videos_go_last_without_comparing_dates():
+    a = [vid("a2", 20), vid("a-undated", None)]
+    b = [vid("b1", 10), vid("b-undated", None)]
+    merged = ids(merge_newest_first(a, b))
+    assert merged[:2] == ["a2", "b1"]
+    assert set(merged[2:]) == {"a-undated", "b-undated"}
+
+
+def test_empty_and_single_lists():
+    assert ids(merge_newest_first()) == []
+    assert ids(merge_newest_first([], [vid("a", None)], [])) == ["a"]
@@ -0,0 +1,58 @@
+"""parse_youtube_feed: the fast YouTube Atom parser, checked against feedparser."""
+import glob
+import os
+
+import pytest
+
+from YouTubeRSSViewer import entry_epoch, parse_feed_bytes, parse_youtube_feed
+
+feedparser = pytest.importorskip("feedparser")
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                         "benchmarks", "fixtures", "*.xml")))
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Blog</title><link>https://example.com/</link>
+<item><title>Post</title><link>https://example.com/post</link><guid>post-1</guid>
+<pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def summarize(feed, limit):
+    """The fields the viewer uses (same reduction as benchmarks/bench_parser.py)."""
+    return (
+        feed.feed.get("title"), feed.feed.get("link"),
+        [(e.get("id"), e.get("title"), e.get("link"), entry_epoch(e), (e.get("media_thumbnail") or [{}])[0].get("url"))
+         for e in feed.entries[:limit]],
+    )
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_fixtures_found():
+    assert FIXTURES
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+@pytest.mark.parametrize("limit", [1, 5, 1000])
+def test_matches_feedparser(path, limit):
+    data = read(path)
+    fast = parse_youtube_feed(data, limit)
+    assert len(fast.entries) <= limit
+    assert summarize(fast, limit) == summarize(feedparser.parse(data), limit)
+
+
+def test_declines_other_feeds():
+    with pytest.raises(ValueError):
+        parse_youtube_feed(RSS)
+    with pytest.raises(ValueError):
+        parse_youtube_feed(b"<feed><title>")
+
+
+def test_parse_feed_bytes_falls_back_to_feedparser():
+    title, link, entries = parse_feed_bytes(RSS, 10)
+    assert (title, link) == ("Blog", "https://example.com/")
+    assert entries == [("post-1", "Post", "https://example.com/post", 1736157600, None, None)]
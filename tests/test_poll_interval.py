@@ -0,0 +1,35 @@
+"""poll_interval_for: poll intervals derived from a channel's upload cadence."""
+from YouTubeRSSViewer import (POLL_CADENCE_DIVISOR, POLL_DEFAULT_INTERVAL, POLL_MAX_INTERVAL, POLL_MIN_INTERVAL,
+                              poll_interval_for)
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+NOW = 1_700_000_000
+
+
+def test_too_little_history_uses_default():
+    assert poll_interval_for([], now=NOW) == POLL_DEFAULT_INTERVAL
+    assert poll_interval_for([NOW - DAY], now=NOW) == POLL_DEFAULT_INTERVAL
+    assert poll_interval_for([None, NOW - DAY, None], now=NOW) == POLL_DEFAULT_INTERVAL
+
+
+def test_fraction_of_median_gap():
+    stamps = [NOW - 8 * HOUR * i for i in range(5)] # One upload every 8 h, the latest just now
+    assert poll_interval_for(stamps, now=NOW) == 8 * HOUR / POLL_CADENCE_DIVISOR
+
+
+def test_order_and_outliers_do_not_matter():
+    stamps = [NOW, NOW - 8 * HOUR, NOW - 16 * HOUR, NOW - 24 * HOUR, NOW - 30 * DAY]
+    assert poll_interval_for(list(reversed(stamps)), now=NOW) == 8 * HOUR / POLL_CADENCE_DIVISOR
+
+
+def test_silent_channel_is_polled_less():
+    stamps = [NOW - 3 * DAY - 2 * HOUR * i for i in range(5)] # Uploads every 2 h, then 3 days of silence
+    assert poll_interval_for(stamps, now=NOW) == 3 * DAY / POLL_CADENCE_DIVISOR
+
+
+def test_interval_is_clamped():
+    busy = [NOW - 60 * i for i in range(10)]
+    assert poll_interval_for(busy, now=NOW) == POLL_MIN_INTERVAL
+    dormant = [NOW - 400 * DAY, NOW - 800 * DAY]
+    assert poll_interval_for(dormant, now=NOW) == POLL_MAX_INTERVAL
@@ -0,0 +1,69 @@
+"""VideoIndex: word and prefix search, the channel facet and incremental updates."""
+from YouTubeRSSViewer import VideoIndex, VideoRecord
+
+
+def videos():
+    return [
+        VideoRecord("a", "Hello World", channel_title="Alpha"),
+        VideoRecord("b", "Hello there", channel_title="Alpha"),
+        VideoRecord("c", "Cooking with gas", channel_title="Beta Kitchen"),
+    ]
+
+
+def indexed():
+    index = VideoIndex()
+    index.update(videos())
+    return index
+
+
+def test_no_filter_returns_none():
+    assert indexed().search("") is None
+
+
+def test_every_word_must_match():
+    assert indexed().search("hello world") == {"a"}
+
+
+def test_last_word_matches_as_prefix():
+    index = indexed()
+    assert index.search("hello wo") == {"a"}
+    assert index.search("coo") == {"c"}
+
+
+def test_channel_names_are_searchable():
+    assert indexed().search("kitchen") == {"c"}
+
+
+def test_short_last_word_is_ignored_until_typed_further():
+    index = indexed()
+    assert index.search("h") is None # Not an empty list on the first keystroke
+    assert index.search("hello w") == {"a", "b"} # Nor when starting the next word
+    assert index.search("he") == {"a", "b"}
+
+
+def test_channel_facet_combines_with_words():
+    index = indexed()
+    assert index.search("", channel="Alpha") == {"a", "b"}
+    assert index.search("there", channel="Alpha") == {"b"}
+    assert index.search("cooking", channel="Alpha") == set()
+
+
+def test_update_reindexes_only_changes():
+    index = indexed()
+    assert index.update(videos()) is False # Same text: nothing to do
+    changed = videos()
+    changed[0] = VideoRecord("a", "Goodbye World", channel_title="Alpha")
+    assert index.update(changed) is True
+    assert index.search("hello") == {"b"}
+    assert index.search("goodbye") == {"a"}
+
+
+def test_removed_videos_leave_the_index():
+    index = indexed()
+    index.update(videos()[1:])
+    assert index.search("world") == set()
+    assert index.search("wo") == set()
+    assert "Alpha" in index.channel_names()
+    index.update([])
+    assert index.channel_names() == []
+    assert index.postings == {} and index.short_prefixes == {}
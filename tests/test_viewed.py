@@ -0,0 +1,71 @@
+"""viewed.json: the packed format 2, migration from the old format and ViewedStore retention."""
+import json
+import time
+
+import pytest
+
+from YouTubeRSSViewer import VIEWED_FILE, VIEWED_FORMAT, VIEWED_TOUCH_INTERVAL, ViewedStore, load_viewed, save_viewed
+
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path) # viewed.json is read from the current folder
+
+
+def test_round_trip_packs_youtube_ids():
+    viewed = {"bbbbbbbbbbb": 200, "aaaaaaaaaaa": 100, "https://example.com/post": 300}
+    save_viewed(viewed)
+    with open(VIEWED_FILE, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data == {
+        "format": VIEWED_FORMAT,
+        "youtube_ids": "aaaaaaaaaaabbbbbbbbbbb",
+        "youtube_viewed": [100, 200],
+        "other": {"https://example.com/post": 300},
+    }
+    assert load_viewed() == viewed
+
+
+def test_old_format_is_migrated_with_current_time():
+    with open(VIEWED_FILE, "w", encoding="utf-8") as f:
+        json.dump({"yt:video:aaaaaaaaaaa": True, "https://example.com/post": True}, f)
+    before = int(time.time())
+    viewed = load_viewed()
+    assert set(viewed) == {"aaaaaaaaaaa", "https://example.com/post"}
+    assert all(stamp >= before for stamp in viewed.values())
+
+
+def test_missing_or_broken_file_loads_empty():
+    assert load_viewed() == {}
+    with open(VIEWED_FILE, "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert load_viewed() == {}
+
+
+def test_store_accepts_full_and_compact_ids():
+    store = ViewedStore(delay=60)
+    assert store.mark("yt:video:aaaaaaaaaaa")
+    assert not store.mark("yt:video:aaaaaaaaaaa")
+    assert "aaaaaaaaaaa" in store and "yt:video:aaaaaaaaaaa" in store
+    store.flush()
+    assert set(load_viewed()) == {"aaaaaaaaaaa"}
+
+
+def test_retention_drops_old_marks_on_load():
+    now = int(time.time())
+    save_viewed({"aaaaaaaaaaa": now - 400 * DAY, "bbbbbbbbbbb": now - DAY})
+    store = ViewedStore(delay=60, retention_days=365)
+    assert "aaaaaaaaaaa" not in store and "bbbbbbbbbbb" in store
+    store.flush()
+    assert set(load_viewed()) == {"bbbbbbbbbbb"}
+
+
+def test_touch_keeps_listed_videos_past_retention():
+    now = int(time.time())
+    save_viewed({"aaaaaaaaaaa": now - 300 * DAY, "bbbbbbbbbbb": now - VIEWED_TOUCH_INTERVAL // 2})
+    store = ViewedStore(delay=60, retention_days=365)
+    assert store.touch(["yt:video:aaaaaaaaaaa", "yt:video:bbbbbbbbbbb", "yt:video:ccccccccccc"]) == 1 # Only stale marks
+    store.flush()
+    assert load_viewed()["aaaaaaaaaaa"] >= now